@@ -1,14 +1,35 @@
+import io
+import json
+import threading
 import time
+from collections import OrderedDict
 
+import pandas as pd
 import streamlit as st
 
+from metrics import collect_metrics
+from pipeline import analyze, extract_and_encode
+from screening import screen_files
 from utils import (
-    analyze_skills,
-    calculate_similarity,
-    extract_text_from_file,
-    get_detailed_analysis,
+    content_hash,
+    get_batcher_stats,
+    get_model_version,
+    start_embedding_batcher,
+    warm_up_model,
 )
 
+# Сколько последних результатов анализа хранить в сессии
+ANALYSIS_MEMO_SIZE = 8
+
+# Этапы анализа: подпись и доля шкалы прогресса (начало, конец)
+STAGE_PROGRESS = {
+    "extraction": ("Извлечение текста", 0.0, 0.2),
+    "segmentation": ("Разбиение на предложения", 0.2, 0.3),
+    "encoding": ("Кодирование предложений", 0.3, 0.8),
+    "skills": ("Поиск навыков и опыта", 0.8, 0.9),
+    "sections": ("Анализ секций резюме", 0.9, 1.0),
+}
+
 # Настройка страницы
 st.set_page_config(
     page_title="HR Assistant - Оценка резюме",
@@ -245,6 +266,27 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+
+def _load_model_in_background():
+    warm_up_model()
+    # Кодирование всех сессий идет через общий планировщик батчей
+    start_embedding_batcher()
+
+
+@st.cache_resource(show_spinner=False)
+def load_model():
+    """Загружает и прогревает модель в фоне один раз для всех сессий
+
+    Интерфейс отрисовывается сразу; анализ, начатый до окончания загрузки,
+    дождется модели в get_model().
+    """
+    thread = threading.Thread(target=_load_model_in_background, daemon=True)
+    thread.start()
+    return thread
+
+
+load_model()
+
 # Основной контент
 st.markdown("### 📋 Описание вакансии")
 job_description = st.text_area(
@@ -254,6 +296,79 @@ job_description = st.text_area(
     placeholder="Вставьте текст описания вакансии здесь...",
 )
 
+mode = st.radio(
+    "Режим работы",
+    ["Одно резюме", "Пакетный скрининг"],
+    horizontal=True,
+    help="Пакетный скрининг ранжирует сразу много резюме по одной вакансии",
+)
+
+
+def render_batch_screening(job_description):
+    """Пакетный режим: загрузка многих резюме (или zip) и таблица рейтинга"""
+    st.markdown("### 📚 Загрузка резюме")
+    uploaded_files = st.file_uploader(
+        "Загрузите резюме (PDF, DOCX или zip-архив)",
+        type=["pdf", "docx", "zip"],
+        accept_multiple_files=True,
+        help="Можно выбрать сразу несколько файлов или загрузить zip-архив",
+    )
+    if not uploaded_files or not job_description:
+        return
+
+    # Повторные нажатия (например, кнопок скачивания) не запускают скрининг заново
+    screening_key = (
+        content_hash(job_description),
+        tuple(content_hash(file.getvalue()) for file in uploaded_files),
+        get_model_version(),
+    )
+    if st.session_state.get("screening_key") != screening_key:
+        with st.spinner("Ранжируем резюме..."):
+            st.session_state["screening_rows"] = screen_files(
+                job_description, uploaded_files
+            )
+        st.session_state["screening_key"] = screening_key
+    rows = st.session_state["screening_rows"]
+
+    st.markdown("### 🏆 Рейтинг кандидатов")
+    table = pd.DataFrame(rows)
+    if "missing_skills" in table:
+        table["missing_skills"] = table["missing_skills"].map(
+            lambda skills: ", ".join(skills) if isinstance(skills, list) else ""
+        )
+    table = table.rename(
+        columns={
+            "file": "Файл",
+            "similarity": "Схожесть, %",
+            "missing_skills": "Отсутствующие навыки",
+            "experience": "Опыт работы, %",
+            "education": "Образование, %",
+            "skills": "Навыки, %",
+            "overall_match": "По секциям, %",
+            "error": "Ошибка",
+        }
+    )
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    col1.download_button(
+        "Скачать CSV",
+        table.to_csv(index=False).encode("utf-8"),
+        file_name="screening.csv",
+        mime="text/csv",
+    )
+    col2.download_button(
+        "Скачать JSON",
+        json.dumps(rows, ensure_ascii=False, indent=2).encode("utf-8"),
+        file_name="screening.json",
+        mime="application/json",
+    )
+
+
+if mode == "Пакетный скрининг":
+    render_batch_screening(job_description)
+    st.stop()
+
 st.markdown("### 📄 Загрузка резюме")
 uploaded_file = st.file_uploader(
     "Загрузите резюме (PDF или DOCX)",
@@ -261,21 +376,109 @@ uploaded_file = st.file_uploader(
     help="Поддерживаются файлы в форматах PDF и DOCX",
 )
 
+
+class StageProgress:
+    """Ведет st.progress по событиям этапов анализа и замеряет их длительность"""
+
+    def __init__(self):
+        self.bar = st.progress(0.0, text="Подготовка...")
+        self.timings = {}
+        self._stage = None
+        self._started = None
+
+    def __call__(self, stage, done, total=None, now=None):
+        if now is None:
+            now = time.perf_counter()
+        if stage != self._stage:
+            self._finish(now)
+            self._stage, self._started = stage, now
+        label, start, end = STAGE_PROGRESS[stage]
+        # Если общее число шагов неизвестно, двигаемся к концу этапа асимптотически
+        fraction = done / total if total else done / (done + 1)
+        text = f"{label}: {done}/{total}" if total else f"{label}: {done}"
+        self.bar.progress(min(1.0, start + (end - start) * fraction), text=text)
+
+    def _finish(self, now):
+        if self._stage is not None:
+            self.timings[self._stage] = self.timings.get(self._stage, 0.0) + (
+                now - self._started
+            )
+
+    def replay(self, events, started, finished):
+        """Повторяет на полосе события, записанные load_resume_text
+
+        Время события — смещение от начала вызова; для результата из кэша
+        оно ограничивается длительностью вызова, и этап занимает ~0 с.
+        """
+        for stage, done, total, offset in events:
+            self(stage, done, total, now=min(started + offset, finished))
+
+    def close(self):
+        self._finish(time.perf_counter())
+        self._stage = None
+        self.bar.progress(1.0, text="Готово")
+
+
+@st.cache_data(max_entries=64, ttl=3600, show_spinner=False)
+def load_resume_text(file_hash, file_name, _file_bytes):
+    """Извлекает текст резюме один раз для одного и того же содержимого файла
+
+    Возвращает текст и события этапов (этап, готово, всего, смещение в
+    секундах). Элементы st внутри кэшируемой функции не трогаем: при
+    повторе из кэша Streamlit не может воспроизвести обращения к ним.
+    """
+    file = io.BytesIO(_file_bytes)
+    file.name = file_name
+    events = []
+    started = time.perf_counter()
+
+    def record(stage, done, total=None):
+        events.append((stage, done, total, time.perf_counter() - started))
+
+    # Предложения кодируются по мере извлечения
+    return extract_and_encode(file, progress=record), events
+
+
 if uploaded_file is not None and job_description:
-    # Показываем прогресс анализа
-    with st.spinner("Анализируем резюме..."):
-        progress_bar = st.progress(0)
-        for i in range(100):
-            time.sleep(0.01)
-            progress_bar.progress(i + 1)
+    # Анализ запускается только при изменении файла, вакансии или модели;
+    # остальные действия в интерфейсе (например, вкладки) берут результат из сессии
+    file_bytes = uploaded_file.getvalue()
+    file_hash = content_hash(file_bytes)
+    analysis_key = (file_hash, content_hash(job_description), get_model_version())
+    analysis_memo = st.session_state.setdefault("analysis_memo", OrderedDict())
 
-        # Извлекаем текст из резюме
-        resume_text = extract_text_from_file(uploaded_file)
+    if analysis_key in analysis_memo:
+        analysis_memo.move_to_end(analysis_key)
+        resume_text, analysis_results, request_metrics = analysis_memo[analysis_key]
+    else:
+        # Показываем реальный прогресс по этапам анализа
+        with st.spinner("Анализируем резюме..."), collect_metrics(
+            "analysis"
+        ) as request_metrics:
+            progress = StageProgress()
+            started = time.perf_counter()
+            resume_text, events = load_resume_text(
+                file_hash, uploaded_file.name, file_bytes
+            )
+            progress.replay(events, started, time.perf_counter())
 
-        # Анализируем соответствие
-        similarity_score = calculate_similarity(job_description, resume_text)
-        analysis_results = analyze_skills(job_description, resume_text)
-        detailed_analysis = get_detailed_analysis(job_description, resume_text)
+            # Анализируем соответствие за один проход по документам. Контекст резюме
+            # хранится в сессии: при правке вакансии пересчитывается только ее часть
+            analysis_results = analyze(
+                job_description, resume_text, st.session_state, progress
+            )
+            progress.close()
+        st.caption(
+            "Время этапов: "
+            + ", ".join(
+                f"{STAGE_PROGRESS[stage][0].lower()} {seconds:.2f} с"
+                for stage, seconds in progress.timings.items()
+            )
+        )
+
+        analysis_memo[analysis_key] = (resume_text, analysis_results, request_metrics)
+        while len(analysis_memo) > ANALYSIS_MEMO_SIZE:
+            analysis_memo.popitem(last=False)
 
     st.markdown("### 📊 Результаты анализа")
 
@@ -380,3 +583,27 @@ if uploaded_file is not None and job_description:
                     f"Секция: {section}, Заголовок: '{h['keyword']}', Позиция: {h['start']}-{h['end']}"
                 )
                 st.write(f"Текст секции (первые 100 символов): {section_text[:100]}")
+
+    # Метрики производительности (если включены через HR_ASSISTANT_METRICS=1)
+    if request_metrics:
+        with st.expander("⚙️ Производительность (отладка)"):
+            counters = request_metrics["counters"]
+            cache = request_metrics["caches"].get("embedding_cache", {})
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Время анализа", f"{request_metrics['wall_seconds']:.2f} с")
+            col2.metric(
+                "Вызовов модели",
+                counters.get("encode_calls", 0),
+                help=f"Закодировано предложений: {counters.get('sentences_encoded', 0)}",
+            )
+            col3.metric("Попадания в кэш", f"{cache.get('hit_rate', 0.0) * 100:.0f}%")
+            if request_metrics["peak_rss_mb"] is not None:
+                col4.metric("Пик памяти", f"{request_metrics['peak_rss_mb']:.0f} МБ")
+            batcher = get_batcher_stats()
+            if batcher:
+                st.caption(
+                    f"Планировщик батчей: средний батч {batcher['mean_batch_size']:.1f}, "
+                    f"ожидание {batcher['mean_wait_ms']:.1f} мс, "
+                    f"очередь {batcher['queue_depth']} (макс. {batcher['max_queue_depth']})"
+                )
+            st.json({**request_metrics, "embedding_batcher": batcher})
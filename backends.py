@@ -0,0 +1,281 @@
+"""Бэкенды инференса энкодера: PyTorch, ONNX Runtime и int8-квантование
+
+Бэкенд выбирается переменной HR_ASSISTANT_BACKEND:
+    torch     — SentenceTransformer как есть (по умолчанию);
+    int8      — SentenceTransformer с динамическим int8-квантованием линейных слоев;
+    onnx      — граф ONNX, экспортированный из кэшированных весов, в ONNX Runtime;
+    onnx-int8 — тот же граф после динамического int8-квантования ONNX Runtime.
+
+ONNX-артефакты собираются локально при первой загрузке и хранятся в
+model_cache/onnx/<модель>/. onnxruntime — необязательная зависимость.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+BACKENDS = ("torch", "int8", "onnx", "onnx-int8")
+
+# Выбранный бэкенд энкодера
+BACKEND = os.environ.get("HR_ASSISTANT_BACKEND", "torch")
+
+# Строгий офлайн-режим: модель и токенизатор только из локального кэша
+OFFLINE = os.environ.get("HR_ASSISTANT_OFFLINE", "0") == "1"
+if OFFLINE:
+    # Читаются библиотеками Hugging Face при импорте, поэтому задаются заранее
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+# Версия opset для экспорта ONNX
+ONNX_OPSET = 14
+
+
+def load_sentence_transformer(model_name, cache_dir):
+    """Исходная модель SentenceTransformer (PyTorch)
+
+    Тяжелые библиотеки импортируются здесь, а не при импорте модуля.
+    """
+    from sentence_transformers import SentenceTransformer
+    from transformers import logging
+
+    # Отключаем предупреждения transformers
+    logging.set_verbosity_error()
+    os.makedirs(cache_dir, exist_ok=True)
+    return SentenceTransformer(model_name, cache_folder=cache_dir)
+
+
+def quantize_int8(model):
+    """Динамическое int8-квантование линейных слоев модели на CPU"""
+    import torch
+
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def _pooling_config(model) -> dict:
+    """Способ пулинга и нормализация из модулей SentenceTransformer"""
+    config = {"mode": "mean", "normalize": False}
+    for module in model:
+        name = type(module).__name__
+        if name == "Pooling":
+            pooling = module.get_config_dict()
+            if pooling.get("pooling_mode_cls_token"):
+                config["mode"] = "cls"
+            elif pooling.get("pooling_mode_max_tokens"):
+                config["mode"] = "max"
+        elif name == "Normalize":
+            config["normalize"] = True
+    return config
+
+
+def onnx_dir(model_name, cache_dir) -> str:
+    return os.path.join(cache_dir, "onnx", model_name.replace("/", "__"))
+
+
+def export_onnx(model_name, cache_dir) -> str:
+    """Экспортирует трансформер модели в ONNX вместе с токенизатором и настройками пулинга"""
+    import torch
+
+    target = onnx_dir(model_name, cache_dir)
+    path = os.path.join(target, "model.onnx")
+    if os.path.exists(path):
+        return target
+
+    model = load_sentence_transformer(model_name, cache_dir)
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    os.makedirs(target, exist_ok=True)
+
+    sample = tokenizer(
+        ["Пример текста", "Sample text"], padding=True, return_tensors="pt"
+    )
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in sample
+    ]
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Обертка: возвращает только эмбеддинги токенов"""
+
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs)))[0]
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(transformer),
+            tuple(sample[name] for name in input_names),
+            path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET,
+        )
+    tokenizer.save_pretrained(target)
+    with open(os.path.join(target, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "model": model_name,
+                "max_seq_length": model.max_seq_length,
+                "dimension": model.get_sentence_embedding_dimension(),
+                "pooling": _pooling_config(model),
+            },
+            f,
+            indent=2,
+        )
+    return target
+
+
+def quantize_onnx(model_name, cache_dir) -> str:
+    """Int8-квантованная копия экспортированного графа ONNX"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    target = export_onnx(model_name, cache_dir)
+    path = os.path.join(target, "model_int8.onnx")
+    if not os.path.exists(path):
+        quantize_dynamic(
+            os.path.join(target, "model.onnx"), path, weight_type=QuantType.QInt8
+        )
+    return target
+
+
+class OnnxEncoder:
+    """Энкодер на ONNX Runtime с интерфейсом SentenceTransformer.encode"""
+
+    def __init__(self, directory, filename="model.onnx", threads=0):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(directory, "config.json"), encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(directory, local_files_only=True)
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(directory, filename),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = [item.name for item in self.session.get_inputs()]
+        self.max_seq_length = self.config["max_seq_length"]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dimension"]
+
+    def _pool(self, token_embeddings, attention_mask):
+        pooling = self.config["pooling"]
+        mask = attention_mask[..., None].astype(np.float32)
+        if pooling["mode"] == "cls":
+            vectors = token_embeddings[:, 0]
+        elif pooling["mode"] == "max":
+            vectors = np.where(mask > 0, token_embeddings, -1e9).max(axis=1)
+        else:
+            vectors = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+        if pooling["normalize"]:
+            vectors = vectors / np.clip(
+                np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None
+            )
+        return vectors.astype(np.float32)
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Кодирует текст или список текстов; батчи собираются из текстов близкой длины"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        result = np.zeros(
+            (len(texts), self.get_sentence_embedding_dimension()), np.float32
+        )
+        # Сортировка по длине уменьшает паддинг внутри батча
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            indices = order[start : start + batch_size]
+            inputs = self.tokenizer(
+                [texts[i] for i in indices],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feed = {name: inputs[name].astype(np.int64) for name in self.input_names}
+            token_embeddings = self.session.run(None, feed)[0]
+            result[indices] = self._pool(token_embeddings, inputs["attention_mask"])
+        return result[0] if single else result
+
+
+def load_encoder(model_name, cache_dir, backend: str = BACKEND):
+    """Загружает энкодер выбранного бэкенда"""
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Неизвестный бэкенд {backend!r}, доступны: {', '.join(BACKENDS)}"
+        )
+    if backend == "torch":
+        return load_sentence_transformer(model_name, cache_dir)
+    if backend == "int8":
+        return quantize_int8(load_sentence_transformer(model_name, cache_dir))
+    if backend == "onnx":
+        return OnnxEncoder(export_onnx(model_name, cache_dir))
+    return OnnxEncoder(quantize_onnx(model_name, cache_dir), "model_int8.onnx")
+
+
+def _mean_max_score(job_vectors, resume_vectors) -> float:
+    from similarity import mean_max_similarity
+
+    return mean_max_similarity(job_vectors, resume_vectors) * 100
+
+
+def parity_report(reference, candidate, sentences, pairs=()) -> dict:
+    """Сравнивает бэкенд с эталонным (PyTorch)
+
+    sentences — тексты для сравнения эмбеддингов: косинусный дрейф
+    1 - cos(эталон, кандидат). pairs — пары (предложения вакансии,
+    предложения резюме): разница итоговой схожести в процентных пунктах.
+    Также замеряется пропускная способность обоих бэкендов.
+    """
+    from similarity import normalize_rows
+
+    def timed_encode(encoder, texts):
+        started = time.perf_counter()
+        vectors = np.asarray(encoder.encode(texts), dtype=np.float32)
+        return vectors, time.perf_counter() - started
+
+    reference_vectors, reference_seconds = timed_encode(reference, sentences)
+    candidate_vectors, candidate_seconds = timed_encode(candidate, sentences)
+    cosine = np.sum(
+        normalize_rows(reference_vectors) * normalize_rows(candidate_vectors), axis=1
+    )
+    drift = 1.0 - cosine
+
+    deltas = []
+    for job_sentences, resume_sentences in pairs:
+        reference_score = _mean_max_score(
+            reference.encode(job_sentences), reference.encode(resume_sentences)
+        )
+        candidate_score = _mean_max_score(
+            candidate.encode(job_sentences), candidate.encode(resume_sentences)
+        )
+        deltas.append(abs(candidate_score - reference_score))
+
+    return {
+        "sentences": len(sentences),
+        "cosine_drift_mean": float(drift.mean()) if len(drift) else 0.0,
+        "cosine_drift_max": float(drift.max()) if len(drift) else 0.0,
+        "score_delta_mean": float(np.mean(deltas)) if deltas else 0.0,
+        "score_delta_max": float(np.max(deltas)) if deltas else 0.0,
+        "reference_sentences_per_second": (
+            len(sentences) / reference_seconds if reference_seconds else None
+        ),
+        "candidate_sentences_per_second": (
+            len(sentences) / candidate_seconds if candidate_seconds else None
+        ),
+    }
@@ -0,0 +1,246 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class EmbeddingBatcher:
+    """Планировщик кодирования: объединяет запросы всех сессий в общие батчи
+
+    Фоновый поток берет запрос из очереди и еще до max_wait секунд
+    собирает следующие, пока они помещаются в max_batch текстов. Затем
+    выполняется один вызов модели, а результаты раздаются через Future.
+    Запросы больше max_batch текстов делятся на части при постановке в
+    очередь. Очередь ограничена max_queue запросами: при переполнении
+    submit ждет.
+    """
+
+    def __init__(
+        self,
+        encode,
+        max_batch: int = 64,
+        max_wait: float = 0.005,
+        max_queue: int = 1024,
+    ):
+        self.encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.encoded = 0
+        self.wait_seconds = 0.0
+        self.max_queue_depth = 0
+        self._stopping = False
+        # Запрос, не поместившийся в предыдущий батч
+        self._carry = None
+        # Ошибка, из-за которой остановился фоновый поток
+        self._failure = None
+        # Поток больше не берет запросы из очереди
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="embedding-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, texts) -> Future:
+        """Ставит тексты в очередь; Future вернет матрицу эмбеддингов в том же порядке"""
+        texts = list(texts)
+        if len(texts) <= self.max_batch:
+            return self._enqueue(texts)
+        parts = [
+            self._enqueue(texts[start : start + self.max_batch])
+            for start in range(0, len(texts), self.max_batch)
+        ]
+        return _gather(parts)
+
+    def _enqueue(self, texts) -> Future:
+        if self._closed or not self._thread.is_alive():
+            raise RuntimeError("Планировщик батчей остановлен") from self._failure
+        future = Future()
+        item = (texts, future, time.monotonic())
+        while True:
+            try:
+                self._queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                if self._closed:
+                    raise RuntimeError(
+                        "Планировщик батчей остановлен"
+                    ) from self._failure
+        if self._closed:
+            # Поток мог завершиться между проверкой и постановкой в очередь:
+            # тогда его последний проход по очереди этот запрос не увидел
+            self._drain()
+        depth = self._queue.qsize()
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+        return future
+
+    def encode_batch(self, texts) -> np.ndarray:
+        """Синхронный вызов: ставит тексты в очередь и ждет результат"""
+        return self.submit(texts).result()
+
+    def _collect(self, first):
+        """Добирает запросы в батч до max_batch текстов или до истечения max_wait"""
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                # Остановка: дообрабатываем собранное и выходим
+                self._stopping = True
+                break
+            if size + len(item[0]) > self.max_batch:
+                # Не помещается: запрос откроет следующий батч
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _process(self, batch):
+        started = time.monotonic()
+        requests = [
+            (texts, future, enqueued)
+            for texts, future, enqueued in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not requests:
+            return
+        unique = list(dict.fromkeys(text for texts, _, _ in requests for text in texts))
+        try:
+            vectors = np.asarray(self.encode(unique), dtype=np.float32)
+        except Exception as e:
+            for _, future, _ in requests:
+                future.set_exception(e)
+            return
+        positions = {text: i for i, text in enumerate(unique)}
+        for texts, future, _ in requests:
+            future.set_result(vectors[[positions[text] for text in texts]])
+        with self._lock:
+            self.batches += 1
+            self.requests += len(requests)
+            self.texts += sum(len(texts) for texts, _, _ in requests)
+            self.encoded += len(unique)
+            self.wait_seconds += sum(started - enqueued for _, _, enqueued in requests)
+
+    def _next(self):
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        return self._queue.get()
+
+    def _run(self):
+        batch = []
+        try:
+            # Запрос, перенесенный из последнего батча, тоже кодируется до выхода
+            while not self._stopping or self._carry is not None:
+                first = self._next()
+                if first is None:
+                    return
+                batch = [first]
+                try:
+                    batch = self._collect(first)
+                    self._process(batch)
+                except Exception as e:
+                    # Ошибка вне вызова модели не должна останавливать поток
+                    _fail(batch, e)
+                batch = []
+        except BaseException as e:
+            self._failure = e
+            print(f"Ошибка планировщика батчей, поток остановлен: {e!r}")
+        finally:
+            # Сначала флаг, затем проход по очереди: запрос, поставленный позже,
+            # увидит флаг и завершит себя сам (см. _enqueue)
+            self._closed = True
+            _fail(batch, self._stopped_error())
+            if self._carry is not None:
+                _fail([self._carry], self._stopped_error())
+                self._carry = None
+            self._drain()
+
+    def _stopped_error(self):
+        error = RuntimeError("Планировщик батчей остановлен")
+        error.__cause__ = self._failure
+        return error
+
+    def _drain(self):
+        """Завершает ошибкой запросы, оставшиеся в очереди после остановки потока"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                _fail([item], self._stopped_error())
+
+    def close(self):
+        """Останавливает фоновый поток после обработки уже поставленных запросов"""
+        if not self._closed:
+            self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """Счетчики планировщика: размер батчей, ожидание в очереди, глубина очереди"""
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "texts": self.texts,
+                "encoded": self.encoded,
+                "mean_batch_size": self.encoded / self.batches if self.batches else 0.0,
+                "mean_wait_ms": (
+                    self.wait_seconds / self.requests * 1000 if self.requests else 0.0
+                ),
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "max_queue": self.max_queue,
+            }
+
+
+def _fail(batch, error):
+    """Завершает незавершенные Future запросов батча ошибкой"""
+    for _, future, _ in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _gather(parts) -> Future:
+    """Future, объединяющий результаты частей запроса в одну матрицу"""
+    result = Future()
+    # Объединенный запрос нельзя отменить: его части уже в очереди
+    result.set_running_or_notify_cancel()
+    remaining = [len(parts)]
+    lock = threading.Lock()
+
+    def on_done(part):
+        with lock:
+            if result.done():
+                return
+            if part.cancelled():
+                result.set_exception(RuntimeError("Часть запроса отменена"))
+            elif part.exception() is not None:
+                result.set_exception(part.exception())
+            else:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    result.set_result(np.concatenate([p.result() for p in parts]))
+
+    for part in parts:
+        part.add_done_callback(on_done)
+    return result
@@ -0,0 +1,72 @@
+"""Сверка бэкендов энкодера с PyTorch: дрейф эмбеддингов, разница оценок и скорость
+
+Запуск: python benchmarks/bench_backends.py --backends int8,onnx,onnx-int8 [--sentences 500]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import BACKENDS, load_encoder, parity_report  # noqa: E402
+from benchmarks.synthetic import make_resume, make_vacancy  # noqa: E402
+from utils import CACHE_DIR, MODEL_NAME, sent_tokenize  # noqa: E402
+
+
+def make_pairs(count: int):
+    """Пары (предложения вакансии, предложения резюме) на обоих языках"""
+    pairs = []
+    for seed in range(count):
+        lang = "ru" if seed % 2 == 0 else "en"
+        job = make_vacancy(10, lang=lang, seed=seed)
+        resume = make_resume(40, lang=lang, seed=seed + 1000)
+        pairs.append((sent_tokenize(job), sent_tokenize(resume)))
+    return pairs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default="int8,onnx,onnx-int8")
+    parser.add_argument("--sentences", type=int, default=500)
+    parser.add_argument("--pairs", type=int, default=10)
+    parser.add_argument("--out", help="сохранить отчет в JSON")
+    args = parser.parse_args(argv)
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        parser.error(f"неизвестные бэкенды: {', '.join(unknown)}")
+
+    sentences = sent_tokenize(
+        make_resume(args.sentences // 2, lang="ru")
+    ) + sent_tokenize(make_resume(args.sentences // 2, lang="en"))
+    pairs = make_pairs(args.pairs)
+    reference = load_encoder(MODEL_NAME, CACHE_DIR, "torch")
+
+    report = {}
+    for name in backends:
+        try:
+            candidate = load_encoder(MODEL_NAME, CACHE_DIR, name)
+        except ImportError as e:
+            print(f"{name}: бэкенд недоступен ({str(e)})")
+            continue
+        report[name] = parity_report(reference, candidate, sentences, pairs)
+        result = report[name]
+        print(
+            f"{name:<10} дрейф косинуса: средний {result['cosine_drift_mean']:.5f}, "
+            f"макс. {result['cosine_drift_max']:.5f}; "
+            f"разница оценки: средняя {result['score_delta_mean']:.2f} п.п., "
+            f"макс. {result['score_delta_max']:.2f} п.п.; "
+            f"скорость {result['candidate_sentences_per_second']:.0f} "
+            f"против {result['reference_sentences_per_second']:.0f} предл/с"
+        )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
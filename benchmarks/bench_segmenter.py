@@ -0,0 +1,136 @@
+"""Сегментаторы предложений: скорость regex против Punkt и согласие их границ
+
+Согласие — точность, полнота и F1 границ предложений regex-сегментатора
+относительно Punkt, а также доля предложений Punkt, найденных без изменений.
+
+Запуск: python benchmarks/bench_segmenter.py [--sizes small,medium] [--resumes ./resumes]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import SIZES, make_resume, make_vacancy  # noqa: E402
+from text_processing import punkt_sent_tokenize, regex_sent_tokenize  # noqa: E402
+
+
+def boundaries(text: str, sentences) -> set:
+    """Позиции концов предложений в исходном тексте"""
+    ends = set()
+    position = 0
+    for sentence in sentences:
+        start = text.find(sentence, position)
+        if start < 0:
+            continue
+        position = start + len(sentence)
+        ends.add(position)
+    return ends
+
+
+def agreement(text: str, reference, candidate) -> dict:
+    """Сравнение границ и предложений candidate с эталоном reference"""
+    expected = boundaries(text, reference)
+    found = boundaries(text, candidate)
+    matched = len(expected & found)
+    precision = matched / len(found) if found else 1.0
+    recall = matched / len(expected) if expected else 1.0
+    candidate_set = set(candidate)
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if matched else 0.0,
+        "exact_sentences": (
+            sum(1 for sentence in reference if sentence in candidate_set)
+            / len(reference)
+            if reference
+            else 1.0
+        ),
+    }
+
+
+def timed_split(segmenter, text: str, repeat: int):
+    """Результат и медианное время разбиения"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        sentences = segmenter(text)
+        times.append(time.perf_counter() - started)
+    return sentences, sorted(times)[len(times) // 2]
+
+
+def make_texts(sizes, resumes_dir=None) -> dict:
+    """Тексты для сравнения: синтетические резюме и вакансии, а также резюме из каталога"""
+    texts = {}
+    for size in sizes:
+        params = SIZES[size]
+        for lang in ("ru", "en"):
+            texts[f"resume[{size},{lang}]"] = make_resume(
+                params["resume_sentences"], lang=lang, seed=2
+            )
+            texts[f"vacancy[{size},{lang}]"] = make_vacancy(
+                params["vacancy_sentences"], lang=lang, seed=1
+            )
+    if resumes_dir:
+        from hr_assistant import extract_path, find_resumes
+
+        for path in find_resumes(resumes_dir):
+            _, text, error = extract_path(path)
+            if error is None and text.strip():
+                texts[os.path.relpath(path, resumes_dir)] = text
+    return texts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="small,medium,huge")
+    parser.add_argument("--resumes", help="каталог с PDF/DOCX резюме для сравнения")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="сохранить отчет в JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"неизвестные размеры: {', '.join(unknown)}")
+
+    try:
+        punkt_sent_tokenize("Проверка. Check.")
+    except LookupError as e:
+        print(f"Punkt недоступен: {str(e)}")
+        return 2
+
+    report = {}
+    for name, text in make_texts(sizes, args.resumes).items():
+        reference, punkt_seconds = timed_split(punkt_sent_tokenize, text, args.repeat)
+        candidate, regex_seconds = timed_split(regex_sent_tokenize, text, args.repeat)
+        result = agreement(text, reference, candidate)
+        result.update(
+            {
+                "chars": len(text),
+                "punkt_sentences": len(reference),
+                "regex_sentences": len(candidate),
+                "punkt_seconds": punkt_seconds,
+                "regex_seconds": regex_seconds,
+                "speedup": punkt_seconds / regex_seconds if regex_seconds else None,
+            }
+        )
+        report[name] = result
+        print(
+            f"{name:<28} F1 {result['f1']:.3f}, совпало предложений "
+            f"{result['exact_sentences']:.1%}; Punkt {punkt_seconds * 1000:.2f} мс, "
+            f"regex {regex_seconds * 1000:.2f} мс"
+            + (f" (×{result['speedup']:.1f})" if result["speedup"] else "")
+        )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
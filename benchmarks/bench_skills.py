@@ -0,0 +1,98 @@
+"""Сравнение скорости и результатов extract_skills: старый поиск по подстроке и новый матчер
+
+Запуск: python benchmarks/bench_skills.py [--sentences 2000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import (  # noqa: E402
+    SKILL_STOP_WORDS,
+    TECH_SKILLS,
+    extract_skills,
+    sent_tokenize,
+)
+
+WORDS = [
+    "разработка",
+    "сервисов",
+    "google",
+    "команда",
+    "experience",
+    "backend",
+    "platform",
+    "goal",
+    "через",
+    "proactive",
+    "requirements",
+    "рабочий",
+    "opensource",
+    "задачи",
+    "storage",
+    "gosuslugi",
+]
+
+
+def legacy_extract_skills(text):
+    """Прежняя реализация: подстрочный поиск каждого навыка в каждом предложении"""
+    sentences = sent_tokenize(text.lower())
+    skills = set()
+    all_tech_keywords = set()
+    for group in TECH_SKILLS.values():
+        all_tech_keywords.update([kw.lower() for kw in group])
+    for sentence in sentences:
+        for tech in all_tech_keywords:
+            if tech in sentence and tech not in SKILL_STOP_WORDS:
+                skills.add(tech)
+    return skills
+
+
+def make_text(sentences: int, skill_density: float = 0.3, seed: int = 0) -> str:
+    """Синтетический текст резюме: skill_density — доля предложений с навыком"""
+    rng = random.Random(seed)
+    keywords = sorted({kw for group in TECH_SKILLS.values() for kw in group})
+    result = []
+    for _ in range(sentences):
+        words = rng.choices(WORDS, k=10)
+        if rng.random() < skill_density:
+            words.append(rng.choice(keywords))
+        rng.shuffle(words)
+        result.append(" ".join(words).capitalize() + ".")
+    return " ".join(result)
+
+
+def measure(func, text, repeat):
+    """Лучшее время выполнения из repeat запусков, в миллисекундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_text(args.sentences, args.density)
+    legacy_ms, legacy = measure(legacy_extract_skills, text, args.repeat)
+    new_ms, new = measure(extract_skills, text, args.repeat)
+
+    print(f"Предложений: {args.sentences}, символов: {len(text)}")
+    print(f"Подстрочный поиск: {legacy_ms:.1f} мс")
+    print(f"Скомпилированный матчер: {new_ms:.1f} мс (x{legacy_ms / new_ms:.1f})")
+    print(f"Только в старой реализации (ложные срабатывания): {sorted(legacy - new)}")
+    print(f"Только в новой реализации: {sorted(new - legacy)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Время старта: импорт модулей, первая отрисовка интерфейса и первый анализ
+
+Каждый замер выполняется в отдельном процессе, чтобы кэши импорта не влияли
+на результат. Скрипт завершается с кодом 1, если замер превысил бюджет.
+
+Запуск: python benchmarks/bench_startup.py [--import-budget 1.5] [--out startup.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которые не должны загружаться при импорте приложения
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "sklearn",
+    "PyPDF2",
+    "docx",
+    "nltk",
+)
+
+IMPORT_SCRIPT = """
+import sys, time, json
+started = time.perf_counter()
+import pipeline, screening
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+RENDER_SCRIPT = """
+import time, json
+from streamlit.testing.v1 import AppTest
+started = time.perf_counter()
+app = AppTest.from_file("app.py", default_timeout=120).run()
+print(json.dumps({"seconds": time.perf_counter() - started, "errors": len(app.exception)}))
+"""
+
+ANALYSIS_SCRIPT = """
+import time, json
+started = time.perf_counter()
+from pipeline import analyze
+from benchmarks.synthetic import make_resume, make_vacancy
+result = analyze(make_vacancy(10, seed=1), make_resume(40, seed=2))
+print(json.dumps({"seconds": time.perf_counter() - started, "similarity": result["similarity"]}))
+"""
+
+
+def run_script(script: str) -> dict:
+    """Выполняет замер в новом процессе интерпретатора и возвращает его JSON"""
+    env = dict(os.environ)
+    # Сохраненные результаты и кэши не должны подменять первый анализ
+    env["HR_ASSISTANT_RESULT_DB"] = ""
+    env["HR_ASSISTANT_EMBEDDING_DB"] = ""
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(completed.stderr.strip() or "замер не вернул результат")
+    return json.loads(lines[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--import-budget", type=float, default=1.5, help="секунды")
+    parser.add_argument("--render-budget", type=float, default=5.0, help="секунды")
+    parser.add_argument("--analysis-budget", type=float, default=60.0, help="секунды")
+    parser.add_argument(
+        "--skip-analysis", action="store_true", help="не загружать модель"
+    )
+    parser.add_argument("--out", help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    checks = [
+        ("import", IMPORT_SCRIPT, args.import_budget),
+        ("first_render", RENDER_SCRIPT, args.render_budget),
+    ]
+    if not args.skip_analysis:
+        checks.append(("first_analysis", ANALYSIS_SCRIPT, args.analysis_budget))
+
+    report = {}
+    failed = False
+    for name, script, budget in checks:
+        try:
+            result = run_script(script)
+        except RuntimeError as e:
+            print(f"{name}: ошибка замера: {str(e)}")
+            failed = True
+            continue
+        result["budget"] = budget
+        report[name] = result
+        over = result["seconds"] > budget
+        failed = failed or over
+        print(
+            f"{name:<15} {result['seconds']:8.2f} с  (бюджет {budget:.1f} с)"
+            + ("  ПРЕВЫШЕН" if over else "")
+        )
+        if result.get("heavy"):
+            print(f"  тяжелые модули при импорте: {', '.join(result['heavy'])}")
+            failed = True
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""Бенчмарки функций анализа на синтетических вакансиях и резюме
+
+Запуск:
+    python benchmarks/run_benchmarks.py --sizes small,medium --save baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --threshold 0.2
+
+С --compare скрипт завершается с кодом 1, если медианное время какой-либо
+функции выросло больше чем на threshold относительно базовой линии.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Дисковый кэш эмбеддингов сделал бы замеры зависимыми от прошлых запусков
+os.environ["HR_ASSISTANT_EMBEDDING_DB"] = ""
+
+import text_processing  # noqa: E402
+import utils  # noqa: E402
+from benchmarks.synthetic import (  # noqa: E402
+    SIZES,
+    make_docx,
+    make_pdf,
+    make_resume,
+    make_vacancy,
+)
+
+# Изменения короче этого порога (в секундах) не считаются регрессией: это шум
+MIN_DELTA = 0.002
+
+
+def make_cases(size: str, lang: str, skill_density: float):
+    """Набор замеров для одного размера: имя -> (функция без аргументов, объем в символах)"""
+    params = SIZES[size]
+    job = make_vacancy(params["vacancy_sentences"], lang=lang, seed=1)
+    resume = make_resume(
+        params["resume_sentences"], lang=lang, skill_density=skill_density, seed=2
+    )
+    docx_bytes = make_docx(resume).getvalue()
+    # Стандартные шрифты PDF без кириллицы: PDF строится из английского резюме
+    pdf_text = make_resume(
+        params["resume_sentences"], lang="en", skill_density=skill_density, seed=2
+    )
+    pdf_bytes = make_pdf(pdf_text, pages=params["pages"]).getvalue()
+
+    def from_bytes(data, name):
+        def run():
+            file = io.BytesIO(data)
+            file.name = name
+            return utils.extract_text_from_file(file)
+
+        return run
+
+    return {
+        "extract_text_from_file[docx]": (
+            from_bytes(docx_bytes, "resume.docx"),
+            len(resume),
+        ),
+        "extract_text_from_file[pdf]": (
+            from_bytes(pdf_bytes, "resume.pdf"),
+            len(pdf_text),
+        ),
+        "extract_skills": (lambda: utils.extract_skills(resume), len(resume)),
+        "split_sections": (lambda: utils._split_sections(resume), len(resume)),
+        "extract_responsibilities": (
+            lambda: utils.extract_responsibilities(resume),
+            len(resume),
+        ),
+        "calculate_similarity": (
+            lambda: utils.calculate_similarity(job, resume),
+            len(job) + len(resume),
+        ),
+        "analyze_skills": (
+            lambda: utils.analyze_skills(job, resume),
+            len(job) + len(resume),
+        ),
+        "get_detailed_analysis": (
+            lambda: utils.get_detailed_analysis(job, resume),
+            len(job) + len(resume),
+        ),
+    }
+
+
+def measure(func, repeat: int, warm_cache: bool) -> list:
+    """Время каждого из repeat вызовов
+
+    Без warm_cache перед каждым вызовом очищаются кэши эмбеддингов, секций
+    и разобранных документов. Стоп-слова загружаются один раз на процесс
+    и остаются в памяти: это не стоимость обработки документа.
+    """
+    times = []
+    for _ in range(repeat):
+        if not warm_cache:
+            utils.embedding_cache.clear()
+            utils.SECTION_PARSER.clear()
+            text_processing.get_document.cache_clear()
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return times
+
+
+def run(sizes, repeat, lang, skill_density, warm_cache) -> dict:
+    results = {}
+    for size in sizes:
+        for name, (func, chars) in make_cases(size, lang, skill_density).items():
+            func()  # прогрев: импорт, компиляция регулярных выражений, загрузка модели
+            times = measure(func, repeat, warm_cache)
+            median = statistics.median(times)
+            results[f"{size}/{name}"] = {
+                "median_seconds": median,
+                "min_seconds": min(times),
+                "max_seconds": max(times),
+                "chars": chars,
+                "chars_per_second": chars / median if median else None,
+            }
+            print(
+                f"{size:>6}  {name:<32} {median * 1000:10.2f} мс  "
+                f"{results[f'{size}/{name}']['chars_per_second'] or 0:14.0f} симв/с"
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Список регрессий: замеры, медиана которых выросла больше чем на threshold"""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            continue
+        before, after = base["median_seconds"], current["median_seconds"]
+        if after > before * (1 + threshold) and after - before > MIN_DELTA:
+            regressions.append((key, before, after))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="small,medium,huge", help="через запятую: " + ",".join(SIZES)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lang", choices=["ru", "en"], default="ru")
+    parser.add_argument(
+        "--density", type=float, default=0.5, help="доля предложений с навыками"
+    )
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="не очищать кэш эмбеддингов между повторами",
+    )
+    parser.add_argument("--save", help="сохранить результаты как базовую линию (JSON)")
+    parser.add_argument("--compare", help="сравнить с базовой линией (JSON)")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="допустимый рост времени, доля"
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"неизвестные размеры: {', '.join(unknown)}")
+
+    if utils.get_model() is None:
+        print("Ошибка: модель не была загружена")
+        return 2
+
+    results = run(sizes, args.repeat, args.lang, args.density, args.warm_cache)
+    report = {
+        "meta": {
+            "created_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": utils.get_model_version(),
+            "lang": args.lang,
+            "density": args.density,
+            "repeat": args.repeat,
+            "warm_cache": args.warm_cache,
+        },
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Базовая линия сохранена: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, before, after in regressions:
+            print(
+                f"Регрессия: {key}: {before * 1000:.2f} мс -> {after * 1000:.2f} мс "
+                f"(+{(after / before - 1) * 100:.0f}%)"
+            )
+        if regressions:
+            return 1
+        print(f"Регрессий нет (порог {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
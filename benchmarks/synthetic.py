@@ -0,0 +1,183 @@
+"""Генерация синтетических вакансий и резюме (RU/EN) и файлов PDF/DOCX для бенчмарков"""
+
+import io
+import random
+
+from docx import Document
+
+SKILLS = [
+    "Python",
+    "Django",
+    "FastAPI",
+    "PostgreSQL",
+    "Redis",
+    "Docker",
+    "Kubernetes",
+    "Kafka",
+    "Go",
+    "Java",
+    "React",
+    "TypeScript",
+    "PyTorch",
+    "scikit-learn",
+    "Airflow",
+    "Spark",
+    "C++",
+    "Git",
+    "Linux",
+    "AWS",
+]
+
+TEMPLATES = {
+    "ru": {
+        "responsibility": [
+            "Разработка backend-сервисов на {skill} для платежной системы.",
+            "Оптимизация запросов к базе данных и внедрение кэширования на {skill}.",
+            "Тестирование API и поддержка CI/CD пайплайнов с использованием {skill}.",
+            "Управление командой из пяти разработчиков и координация релизов.",
+            "Анализ требований заказчика и создание технической документации.",
+        ],
+        "filler": [
+            "Работал в распределенной команде с заказчиками из разных стран.",
+            "Участвовал в код-ревью и наставничестве младших коллег.",
+            "Проект обслуживал более миллиона пользователей в месяц.",
+            "Компания занимается электронной коммерцией и логистикой.",
+        ],
+        "vacancy": [
+            "Требуется опыт коммерческой разработки на {skill} от трех лет.",
+            "Вы будете заниматься разработкой и поддержкой сервисов на {skill}.",
+            "Обязанности: оптимизация производительности и тестирование.",
+            "Плюсом будет опыт управления небольшой командой.",
+        ],
+        "headers": ("Опыт работы", "Образование", "Навыки"),
+        "education": "МГУ им. Ломоносова, факультет ВМК, магистр прикладной математики.",
+    },
+    "en": {
+        "responsibility": [
+            "Development of backend services in {skill} for a payments platform.",
+            "Optimization of database queries and implementation of caching with {skill}.",
+            "Testing of public APIs and maintenance of CI/CD pipelines using {skill}.",
+            "Management of a team of five engineers and coordination of releases.",
+            "Analysis of customer requirements and creation of technical documentation.",
+        ],
+        "filler": [
+            "Worked in a distributed team with customers across several time zones.",
+            "Took part in code reviews and mentoring of junior colleagues.",
+            "The product served more than a million users per month.",
+            "The company operates in e-commerce and logistics.",
+        ],
+        "vacancy": [
+            "We expect at least three years of commercial experience with {skill}.",
+            "You will develop and maintain services written in {skill}.",
+            "Responsibilities include performance optimization and testing.",
+            "Experience managing a small team is a plus.",
+        ],
+        "headers": ("Work experience", "Education", "Skills"),
+        "education": "Imperial College London, MSc in Computer Science.",
+    },
+}
+
+# Размеры документов: число предложений в резюме и вакансии, страниц в PDF
+SIZES = {
+    "small": {"resume_sentences": 20, "vacancy_sentences": 8, "pages": 1},
+    "medium": {"resume_sentences": 150, "vacancy_sentences": 25, "pages": 5},
+    "huge": {"resume_sentences": 1500, "vacancy_sentences": 60, "pages": 50},
+}
+
+
+def make_vacancy(sentences: int, lang: str = "ru", seed: int = 0) -> str:
+    """Синтетическое описание вакансии из sentences предложений"""
+    rng = random.Random(seed)
+    templates = TEMPLATES[lang]
+    lines = []
+    for _ in range(sentences):
+        pool = templates["vacancy"] + templates["responsibility"]
+        lines.append(rng.choice(pool).format(skill=rng.choice(SKILLS)))
+    return " ".join(lines)
+
+
+def make_resume(
+    sentences: int, lang: str = "ru", skill_density: float = 0.5, seed: int = 0
+) -> str:
+    """Синтетическое резюме с секциями; skill_density — доля предложений с навыком"""
+    rng = random.Random(seed)
+    templates = TEMPLATES[lang]
+    experience, education, skills = templates["headers"]
+    lines = [experience]
+    for _ in range(sentences):
+        if rng.random() < skill_density:
+            template = rng.choice(templates["responsibility"])
+        else:
+            template = rng.choice(templates["filler"])
+        lines.append(template.format(skill=rng.choice(SKILLS)))
+    lines += [education, templates["education"], skills]
+    lines.append(", ".join(rng.sample(SKILLS, k=min(len(SKILLS), 8))))
+    return "\n".join(lines)
+
+
+def make_docx(text: str, name: str = "resume.docx") -> io.BytesIO:
+    """DOCX-файл в памяти: по абзацу на строку текста"""
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    file = io.BytesIO()
+    doc.save(file)
+    file.seek(0)
+    file.name = name
+    return file
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str, pages: int = 1, name: str = "resume.pdf") -> io.BytesIO:
+    """Минимальный PDF со стандартным шрифтом Helvetica, текст делится на pages страниц
+
+    Стандартные шрифты PDF не содержат кириллицы, поэтому для PDF
+    используются английские тексты (lang="en").
+    """
+    lines = text.splitlines()
+    per_page = max(1, -(-len(lines) // pages))
+    page_lines = [lines[i : i + per_page] for i in range(0, len(lines), per_page)]
+
+    objects = [b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages_id = 1 + 2 * len(page_lines) + 1
+    page_ids = []
+    for chunk in page_lines:
+        content = (
+            "BT /F1 10 Tf 40 800 Td 12 TL "
+            + " ".join(f"({_pdf_escape(line)}) '" for line in chunk)
+            + " ET"
+        )
+        data = content.encode("latin-1", "replace")
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Contents %d 0 R /Resources << /Font << /F1 1 0 R >> >> >>"
+            % (pages_id, content_id)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects.append(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+    objects.append(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        len(objects),
+        xref,
+    )
+    file = io.BytesIO(bytes(out))
+    file.name = name
+    return file
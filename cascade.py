@@ -0,0 +1,177 @@
+"""Каскадный скрининг: дешевый лексический отбор перед нейросетевой оценкой
+
+Первый этап оценивает все резюме по TF-IDF или BM25 (тексты после
+preprocess_text) и пересечению навыков из TECH_SKILLS. Нейросетевой
+скрининг проходят только top_k лучших и резюме с оценкой не ниже
+min_score. Отчет о полноте сравнивает результат с полным скринингом.
+"""
+
+import numpy as np
+
+from screening import BATCH_SIZE, screen_resumes
+from utils import (
+    VacancyProfile,
+    compile_vacancy,
+    extract_skills,
+    preprocess_text,
+    vacancy_text,
+)
+
+# Вес пересечения навыков в лексической оценке (остальное — текстовая близость)
+SKILL_WEIGHT = 0.3
+
+# Параметры BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+METHODS = ("tfidf", "bm25")
+
+
+def _tfidf_scores(job_text, resume_texts):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(sublinear_tf=True)
+    matrix = vectorizer.fit_transform(resume_texts + [job_text])
+    # Строки TF-IDF нормированы, скалярное произведение — косинус
+    return (matrix[:-1] @ matrix[-1].T).toarray().ravel()
+
+
+def _bm25_scores(job_text, resume_texts):
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    vectorizer = CountVectorizer()
+    counts = vectorizer.fit_transform(resume_texts).tocsc().astype(np.float64)
+    query = vectorizer.transform([job_text]).indices
+    if not len(query):
+        return np.zeros(len(resume_texts))
+    lengths = np.asarray(counts.sum(axis=1)).ravel()
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+    frequency = np.diff(counts.indptr)
+    n = len(resume_texts)
+    scores = np.zeros(n)
+    for term in query:
+        rows = counts.indices[counts.indptr[term] : counts.indptr[term + 1]]
+        tf = counts.data[counts.indptr[term] : counts.indptr[term + 1]]
+        idf = np.log(1 + (n - frequency[term] + 0.5) / (frequency[term] + 0.5))
+        scores[rows] += idf * tf * (BM25_K1 + 1) / (tf + norm[rows])
+    top = scores.max()
+    # Приводим к [0, 1], чтобы складывать с долей совпавших навыков
+    return scores / top if top > 0 else scores
+
+
+def lexical_scores(
+    job_description,
+    resume_texts,
+    method: str = "tfidf",
+    skill_weight: float = SKILL_WEIGHT,
+) -> np.ndarray:
+    """Лексическая оценка каждого резюме в диапазоне [0, 1] (вакансия — текст или профиль)"""
+    if method not in METHODS:
+        raise ValueError(
+            f"Неизвестный метод {method!r}, доступны: {', '.join(METHODS)}"
+        )
+    if not resume_texts:
+        return np.zeros(0)
+    job_text = preprocess_text(vacancy_text(job_description))
+    texts = [preprocess_text(text) for text in resume_texts]
+    if method == "bm25":
+        text_scores = _bm25_scores(job_text, texts)
+    else:
+        text_scores = _tfidf_scores(job_text, texts)
+
+    if isinstance(job_description, VacancyProfile):
+        job_skills = job_description.skills
+    else:
+        job_skills = extract_skills(job_description)
+    if not job_skills:
+        return text_scores
+    skill_scores = np.array(
+        [
+            len(job_skills & extract_skills(text)) / len(job_skills)
+            for text in resume_texts
+        ]
+    )
+    return (1 - skill_weight) * text_scores + skill_weight * skill_scores
+
+
+def select_candidates(scores, top_k: int = None, min_score: float = None) -> list:
+    """Индексы резюме, прошедших отбор: из top_k лучших или с оценкой не ниже min_score
+
+    Без ограничений отбор проходят все резюме.
+    """
+    if top_k is None and min_score is None:
+        return list(range(len(scores)))
+    selected = set()
+    if top_k is not None:
+        selected.update(np.argsort(-scores, kind="stable")[:top_k].tolist())
+    if min_score is not None:
+        selected.update(np.flatnonzero(scores >= min_score).tolist())
+    return sorted(selected)
+
+
+def recall_report(cascade_rows, full_rows, k: int = None) -> dict:
+    """Сравнение рейтинга каскада с полным скринингом
+
+    k — глубина сравнения (по умолчанию число прошедших отбор резюме).
+    При нулевой глубине полнота не определена и равна None.
+    """
+    ranked = [row["file"] for row in cascade_rows if "similarity" in row]
+    full = [row["file"] for row in full_rows]
+    k = min(len(ranked) if k is None else k, len(full))
+    full_top = full[:k]
+    cascade_top = ranked[:k]
+    missed = [name for name in full_top if name not in set(ranked)]
+    return {
+        "k": k,
+        "selected": len(ranked),
+        "total": len(full),
+        "recall_at_k": (k - len(missed)) / k if k else None,
+        "missed": missed,
+        "rank_changes": sum(
+            1
+            for position, name in enumerate(full_top)
+            if position >= len(cascade_top) or cascade_top[position] != name
+        ),
+    }
+
+
+def cascade_screen(
+    job_description,
+    resumes,
+    top_k: int = None,
+    min_score: float = None,
+    method: str = "tfidf",
+    skill_weight: float = SKILL_WEIGHT,
+    batch_size: int = BATCH_SIZE,
+    with_recall: bool = False,
+):
+    """Каскадный скрининг списка (имя, текст)
+
+    Возвращает (строки, отчет). Прошедшие отбор резюме ранжируются
+    screen_resumes и идут первыми; отсеянные — следом, по убыванию
+    лексической оценки, с пометкой filtered. Отчет о полноте строится,
+    только если with_recall (тогда все резюме проходят и полный скрининг).
+    """
+    # Вакансия компилируется один раз для нейросетевого этапа и отчета о полноте
+    if resumes:
+        job_description = compile_vacancy(job_description)
+    scores = lexical_scores(
+        job_description, [text for _, text in resumes], method, skill_weight
+    )
+    selected = select_candidates(scores, top_k, min_score)
+    rows = screen_resumes(job_description, [resumes[i] for i in selected], batch_size)
+    lexical = {name: float(score) for (name, _), score in zip(resumes, scores)}
+    for row in rows:
+        row["lexical_score"] = lexical[row["file"]]
+    selected_set = set(selected)
+    filtered = [
+        {"file": resumes[i][0], "lexical_score": float(scores[i]), "filtered": True}
+        for i in np.argsort(-scores, kind="stable")
+        if i not in selected_set
+    ]
+
+    report = None
+    if with_recall:
+        full_rows = screen_resumes(job_description, resumes, batch_size)
+        report = recall_report(rows, full_rows, top_k)
+    return rows + filtered, report
@@ -0,0 +1,139 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """Нормализует текст перед кодированием (схлопывает пробелы и переносы)"""
+    return " ".join(text.split())
+
+
+def make_key(model_id: str, text: str) -> str:
+    """Ключ кэша: идентификатор модели + хэш нормализованного текста"""
+    digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model_id}:{digest}"
+
+
+class EmbeddingCache:
+    """Кэш эмбеддингов предложений: LRU в памяти и необязательный уровень в SQLite"""
+
+    def __init__(self, max_entries: int = 20000, db_path: str = None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path):
+        """Открывает (или создает) базу SQLite для постоянного хранения"""
+        try:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Ошибка при открытии кэша эмбеддингов: {str(e)}")
+            self._db = None
+
+    def _remember(self, key, vector):
+        """Добавляет вектор в LRU и вытесняет самые старые записи"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_from_db(self, keys):
+        """Читает векторы из SQLite по списку ключей"""
+        found = {}
+        if self._db is None or not keys:
+            return found
+        try:
+            # SQLite ограничивает число параметров в запросе, читаем порциями
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).reshape(dim)
+        except sqlite3.Error as e:
+            print(f"Ошибка при чтении кэша эмбеддингов: {str(e)}")
+        return found
+
+    def get_many(self, keys):
+        """Возвращает словарь {ключ: вектор} для найденных в кэше ключей"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self.hits += 1
+                else:
+                    missing.append(key)
+
+            from_db = self._load_from_db(missing)
+            for key, vector in from_db.items():
+                self._remember(key, vector)
+                found[key] = vector
+            self.disk_hits += len(from_db)
+            self.hits += len(from_db)
+            self.misses += len(missing) - len(from_db)
+        return found
+
+    def put_many(self, items):
+        """Сохраняет векторы в памяти и, если включено, на диске"""
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, np.asarray(vector, dtype=np.float32))
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                    [
+                        (
+                            key,
+                            int(vector.shape[0]),
+                            np.asarray(vector, np.float32).tobytes(),
+                        )
+                        for key, vector in items.items()
+                    ],
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Ошибка при записи кэша эмбеддингов: {str(e)}")
+
+    def clear(self):
+        """Очищает кэш в памяти и счетчики (данные на диске сохраняются)"""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Счетчики попаданий и промахов для мониторинга"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._memory),
+                "max_entries": self.max_entries,
+                "persistent": self._db is not None,
+            }
@@ -0,0 +1,288 @@
+import io
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+# Ограничения на один файл: страницы, объем извлеченного текста и время
+MAX_PAGES = int(os.environ.get("HR_ASSISTANT_MAX_PAGES", "100"))
+MAX_CHARS = int(os.environ.get("HR_ASSISTANT_MAX_CHARS", "2000000"))
+# Время проверяется между страницами и блоками: зависший разбор одной страницы
+# прерывается только при извлечении PDF в пуле процессов (EXTRACT_WORKERS > 0)
+EXTRACT_TIMEOUT = float(os.environ.get("HR_ASSISTANT_EXTRACT_TIMEOUT", "60"))
+EXTRACT_WORKERS = int(os.environ.get("HR_ASSISTANT_EXTRACT_WORKERS", "0"))
+
+# Сколько страниц PDF отдавать одному процессу при параллельном извлечении
+PAGES_PER_TASK = 8
+
+# Незаконченное предложение длиннее этого не переносится в следующий фрагмент:
+# иначе текст без знаков препинания заново токенизировался бы с каждым фрагментом
+MAX_SENTENCE_TAIL = 1000
+
+
+class ExtractionTimeout(TimeoutError):
+    """Извлечение текста из файла не уложилось в отведенное время"""
+
+
+class UnsupportedFormatError(ValueError):
+    """Файл не PDF и не DOCX"""
+
+
+class _Budget:
+    """Следит за лимитами объема текста и времени при извлечении одного файла"""
+
+    def __init__(self, name, max_chars, timeout):
+        self.name = name
+        self.max_chars = max_chars
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.chars = 0
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check_time(self):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise ExtractionTimeout(f"Превышено время извлечения текста: {self.name}")
+
+    def take(self, chunk):
+        """Обрезает фрагмент по лимиту объема; None — лимит исчерпан"""
+        self.check_time()
+        if self.max_chars and self.chars >= self.max_chars:
+            return None
+        if self.max_chars and self.chars + len(chunk) > self.max_chars:
+            print(
+                f"Предупреждение: текст файла {self.name} обрезан до {self.max_chars} символов"
+            )
+            chunk = chunk[: self.max_chars - self.chars]
+        self.chars += len(chunk)
+        return chunk
+
+
+def _extract_pdf_range(data, start, stop):
+    """Извлекает текст диапазона страниц PDF (выполняется в процессе пула)"""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pdf_pages(
+    file,
+    max_pages: int = MAX_PAGES,
+    max_chars: int = MAX_CHARS,
+    timeout: float = EXTRACT_TIMEOUT,
+    workers: int = None,
+):
+    """Потоково извлекает текст PDF постранично
+
+    Без workers таймаут проверяется только между страницами: зависший
+    extract_text() одной страницы он не прервет. workers > 0 включает
+    извлечение страниц в общем пуле процессов для файлов длиннее
+    PAGES_PER_TASK страниц; по истечении timeout пул принудительно
+    завершается и при следующем вызове создается заново.
+    """
+    import PyPDF2
+
+    name = getattr(file, "name", "PDF")
+    budget = _Budget(name, max_chars, timeout)
+    if workers is None:
+        workers = EXTRACT_WORKERS
+    data = file.read() if workers else None
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data) if workers else file)
+    total = len(pdf_reader.pages)
+    if max_pages and total > max_pages:
+        print(f"Предупреждение: в файле {name} обработаны первые {max_pages} страниц")
+        total = max_pages
+    # Короткие файлы не стоят передачи в пул
+    if workers and total > PAGES_PER_TASK:
+        yield from _iter_pdf_pages_parallel(data, total, budget, workers)
+        return
+
+    for i in range(total):
+        chunk = budget.take(pdf_reader.pages[i].extract_text() or "")
+        if chunk is None:
+            break
+        yield chunk
+
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """Общий пул процессов извлечения (создается при первом использовании)
+
+    Процессы запускаются методом spawn: fork из фонового потока prefetch
+    мог бы унаследовать захваченные другими потоками блокировки.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.close()
+            _pool = multiprocessing.get_context("spawn").Pool(processes=workers)
+            _pool_workers = workers
+        return _pool
+
+
+def _terminate_pool(pool):
+    """Останавливает пул с зависшими процессами; следующий вызов создаст новый"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.terminate()
+    pool.join()
+
+
+def _iter_pdf_pages_parallel(data, total, budget, workers):
+    """Параллельное извлечение страниц PDF диапазонами по PAGES_PER_TASK"""
+    pool = _get_pool(workers)
+    results = [
+        pool.apply_async(
+            _extract_pdf_range, (data, start, min(start + PAGES_PER_TASK, total))
+        )
+        for start in range(0, total, PAGES_PER_TASK)
+    ]
+    for result in results:
+        try:
+            pages = result.get(timeout=budget.remaining())
+        except multiprocessing.TimeoutError:
+            # Зависшие процессы сами не завершатся: останавливаем пул принудительно
+            _terminate_pool(pool)
+            raise ExtractionTimeout(
+                f"Превышено время извлечения текста: {budget.name}"
+            ) from None
+        for page_text in pages:
+            chunk = budget.take(page_text)
+            if chunk is None:
+                return
+            yield chunk
+
+
+def _iter_docx_body(doc):
+    """Абзацы и таблицы DOCX в порядке следования в документе"""
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    for child in doc.element.body.iterchildren():
+        if child.tag.endswith("}p"):
+            yield Paragraph(child, doc)
+        elif child.tag.endswith("}tbl"):
+            yield Table(child, doc)
+
+
+def iter_docx_blocks(
+    file, max_chars: int = MAX_CHARS, timeout: float = EXTRACT_TIMEOUT
+):
+    """Потоково извлекает текст DOCX: абзацы и строки таблиц (ячейки через " | ")"""
+    from docx import Document
+    from docx.table import Table
+
+    budget = _Budget(getattr(file, "name", "DOCX"), max_chars, timeout)
+    doc = Document(file)
+    for block in _iter_docx_body(doc):
+        if not isinstance(block, Table):
+            lines = [block.text]
+        else:
+            lines = []
+            for row in block.rows:
+                # Объединенные ячейки повторяются в row.cells, убираем дубли
+                cells = list(dict.fromkeys(cell.text.strip() for cell in row.cells))
+                lines.append(" | ".join(cell for cell in cells if cell))
+        for line in lines:
+            chunk = budget.take(line + "\n")
+            if chunk is None:
+                return
+            yield chunk
+
+
+def iter_text_chunks(file, workers: int = None):
+    """Потоково извлекает текст из PDF или DOCX файла"""
+    name = file.name.lower()
+    if name.endswith(".pdf"):
+        return iter_pdf_pages(file, workers=workers)
+    elif name.endswith(".docx"):
+        return iter_docx_blocks(file)
+    else:
+        raise UnsupportedFormatError("Неподдерживаемый формат файла")
+
+
+def prefetch(chunks, max_chunks: int = 16):
+    """Извлекает фрагменты в фоновом потоке, чтобы обработка шла параллельно с разбором"""
+    buffer = queue.Queue(maxsize=max_chunks)
+    done = object()
+    stop = threading.Event()
+
+    def put(item):
+        # Не блокируемся навсегда, если потребитель перестал читать
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+        except Exception as e:
+            put(e)
+        put(done)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_sentences(chunks, tokenize, max_tail: int = MAX_SENTENCE_TAIL):
+    """Разбивает поток фрагментов на предложения по мере поступления
+
+    Фрагменты склеиваются без разделителя, как в "".join(chunks), поэтому
+    предложения совпадают с разбиением итогового текста. Последнее
+    предложение фрагмента может быть неполным и переносится в следующий.
+    Перенос длиннее max_tail символов отбрасывается, а не токенизируется
+    заново с каждым фрагментом; предложение, которое он начинал, и первое
+    предложение после него поток пропускает (они появятся только в
+    итоговом разбиении текста).
+    """
+    pending = ""
+    skipping = False
+    for chunk in chunks:
+        buffer = pending + chunk
+        sentences = tokenize(buffer)
+        if not sentences:
+            pending = ""
+            continue
+        if skipping:
+            if len(sentences) < 2:
+                # Длинное предложение еще не закончилось
+                pending = ""
+                continue
+            sentences = sentences[1:]
+            skipping = False
+        last = sentences.pop()
+        yield from sentences
+        start = buffer.rfind(last)
+        pending = buffer[start:] if start >= 0 else last
+        if max_tail and len(pending) > max_tail:
+            pending = ""
+            skipping = True
+    if pending.strip() and not skipping:
+        yield pending.strip()
@@ -0,0 +1,457 @@
+"""Консольный интерфейс HR Assistant
+
+Примеры:
+    python -m hr_assistant screen --job job.txt --resumes ./resumes --workers 4 --out results.jsonl
+    python -m hr_assistant screen --job job.txt --resumes ./resumes --out top.csv --top-k 50
+    python -m hr_assistant profile --job job.txt --out job.npz
+    python -m hr_assistant match --jobs ./jobs --resumes ./resumes --out matrix.npy -k 10
+    python -m hr_assistant index add --index ./talent_pool --resumes ./resumes
+    python -m hr_assistant index search --index ./talent_pool --job job.txt -k 20
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from extraction import UnsupportedFormatError
+from matching import BLOCK_SENTENCES, score_matrix
+from screening import BATCH_SIZE, SUPPORTED_EXTENSIONS, screen_resumes
+from utils import VacancyProfile, compile_vacancy, extract_text_from_file
+
+# Сколько резюме накапливать перед отправкой в энкодер
+CHUNK_SIZE = 64
+
+CSV_FIELDS = [
+    "file",
+    "similarity",
+    "missing_skills",
+    "experience",
+    "education",
+    "skills",
+    "overall_match",
+    "error",
+]
+
+# Дополнительные колонки каскадного режима
+CASCADE_FIELDS = ["lexical_score", "filtered"]
+
+
+def find_resumes(directory):
+    """Рекурсивно находит PDF/DOCX файлы в каталоге"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def extract_path(path):
+    """Извлекает текст из файла по пути (выполняется в процессе пула)
+
+    Ошибка возвращается строкой, а неподдерживаемый формат — самим исключением
+    UnsupportedFormatError, чтобы такой файл не записывался как обработанный.
+    """
+    try:
+        with open(path, "rb") as file:
+            return path, extract_text_from_file(file), None
+    except UnsupportedFormatError as e:
+        return path, "", e
+    except Exception as e:
+        return path, "", str(e)
+
+
+def add_error(errors, path, error):
+    """Добавляет ошибку извлечения в результаты (неподдерживаемый формат — только в лог)"""
+    if isinstance(error, UnsupportedFormatError):
+        print(f"Пропущен {path}: {error}", file=sys.stderr)
+    else:
+        errors.append({"file": path, "error": error})
+
+
+def read_done(out_path, fmt):
+    """Файлы, уже записанные в выходной файл (для продолжения прерванного запуска)"""
+    if not os.path.exists(out_path):
+        return set()
+    done = set()
+    with open(out_path, encoding="utf-8", newline="") as out:
+        if fmt == "csv":
+            for row in csv.DictReader(out):
+                done.add(row["file"])
+        else:
+            for line in out:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    done.add(json.loads(line)["file"])
+                except (ValueError, KeyError):
+                    # Последняя строка могла оборваться при аварийной остановке
+                    continue
+    return done
+
+
+class ResultWriter:
+    """Пишет результаты построчно в JSONL или CSV и сразу сбрасывает их на диск"""
+
+    def __init__(self, out_path, fmt, fields=CSV_FIELDS, append=True):
+        self.fmt = fmt
+        self.fields = fields
+        is_new = (
+            not append or not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+        )
+        self.file = open(out_path, "a" if append else "w", encoding="utf-8", newline="")
+        self.csv = None
+        if fmt == "csv":
+            self.csv = csv.DictWriter(self.file, fieldnames=fields)
+            if is_new:
+                self.csv.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.csv is not None:
+                row = dict(row)
+                row["missing_skills"] = ";".join(row.get("missing_skills", []))
+                self.csv.writerow({field: row.get(field, "") for field in self.fields})
+            else:
+                self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def load_job(path):
+    """Вакансия из текстового файла или сохраненный профиль вакансии (.npz)"""
+    if path.endswith(".npz"):
+        return VacancyProfile.load(path)
+    with open(path, encoding="utf-8") as job_file:
+        return job_file.read()
+
+
+def screen_command(args):
+    """Скрининг каталога резюме по одной вакансии с потоковой записью результатов"""
+    # Вакансия компилируется один раз для всех порций резюме
+    job_description = compile_vacancy(load_job(args.job))
+
+    fmt = args.format or ("csv" if args.out.endswith(".csv") else "jsonl")
+    if args.top_k is not None or args.min_lexical is not None:
+        # Рейтинг каскада строится по всем резюме сразу: продолжение прерванного
+        # запуска смешало бы в одном файле два разных рейтинга
+        paths = find_resumes(args.resumes)
+        print(f"Найдено резюме: {len(paths)}", file=sys.stderr)
+        return cascade_command(args, job_description, paths, fmt)
+
+    done = read_done(args.out, fmt)
+    paths = [path for path in find_resumes(args.resumes) if path not in done]
+    print(
+        f"Найдено резюме: {len(paths) + len(done)}, уже обработано: {len(done)}",
+        file=sys.stderr,
+    )
+
+    writer = ResultWriter(args.out, fmt)
+    processed = 0
+    chunk = []
+    errors = []
+
+    def flush():
+        nonlocal processed
+        if chunk:
+            writer.write(screen_resumes(job_description, chunk, args.batch_size))
+        writer.write(errors)
+        processed += len(chunk) + len(errors)
+        print(f"Обработано: {processed}/{len(paths)}", file=sys.stderr)
+        chunk.clear()
+        errors.clear()
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            for path, text, error in executor.map(extract_path, paths, chunksize=4):
+                if error is not None:
+                    add_error(errors, path, error)
+                else:
+                    chunk.append((path, text))
+                if len(chunk) + len(errors) >= args.chunk_size:
+                    flush()
+            if chunk or errors:
+                flush()
+    finally:
+        writer.close()
+    print(f"Готово: {processed} резюме записано в {args.out}", file=sys.stderr)
+    return 0
+
+
+def cascade_command(args, job_description, paths, fmt):
+    """Каскадный скрининг: лексический отбор всех резюме, нейросетевая оценка лучших
+
+    Файл результатов перезаписывается целиком: в отличие от обычного
+    скрининга, прерванный каскадный запуск не продолжается.
+    """
+    from cascade import cascade_screen
+
+    resumes = []
+    errors = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for path, text, error in executor.map(extract_path, paths, chunksize=4):
+            if error is not None:
+                add_error(errors, path, error)
+            else:
+                resumes.append((path, text))
+    print(
+        f"Текст извлечен: {len(resumes)} резюме, ошибок: {len(errors)}",
+        file=sys.stderr,
+    )
+
+    rows, report = cascade_screen(
+        job_description,
+        resumes,
+        top_k=args.top_k,
+        min_score=args.min_lexical,
+        method=args.lexical_method,
+        batch_size=args.batch_size,
+        with_recall=args.recall_report is not None,
+    )
+    writer = ResultWriter(args.out, fmt, CSV_FIELDS + CASCADE_FIELDS, append=False)
+    try:
+        writer.write(rows)
+        writer.write(errors)
+    finally:
+        writer.close()
+    selected = sum(1 for row in rows if not row.get("filtered"))
+    print(
+        f"Готово: {selected} из {len(resumes)} резюме прошли отбор, "
+        f"результаты записаны в {args.out}",
+        file=sys.stderr,
+    )
+    if report is not None:
+        with open(args.recall_report, "w", encoding="utf-8") as out:
+            json.dump(report, out, ensure_ascii=False, indent=2)
+        recall = report["recall_at_k"]
+        print(
+            f"Полнота@{report['k']}: "
+            + (f"{recall:.2f}" if recall is not None else "не определена")
+            + f", позиций с другим резюме: {report['rank_changes']}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def index_command(args):
+    """Работа с постоянным индексом резюме: добавление, удаление, поиск"""
+    from resume_index import ResumeIndex
+
+    index = ResumeIndex(args.index)
+    try:
+        if args.action == "add":
+            paths = [path for path in find_resumes(args.resumes) if path not in index]
+            with ProcessPoolExecutor(max_workers=args.workers) as executor:
+                for i, (path, text, error) in enumerate(
+                    executor.map(extract_path, paths, chunksize=4), 1
+                ):
+                    if error is not None:
+                        print(f"Пропущен {path}: {error}", file=sys.stderr)
+                        continue
+                    index.add(path, text, name=os.path.basename(path))
+                    print(f"Добавлено: {i}/{len(paths)}", file=sys.stderr)
+        elif args.action == "delete":
+            for resume_id in args.ids:
+                if not index.delete(resume_id):
+                    print(f"Не найдено в индексе: {resume_id}", file=sys.stderr)
+        elif args.action == "build-ivf":
+            index.build_ivf(args.lists)
+        elif args.action == "search":
+            job_description = load_job(args.job)
+            results = index.search(
+                job_description, k=args.k, section=args.section, n_probe=args.probe
+            )
+            for result in results:
+                print(json.dumps(result, ensure_ascii=False))
+    finally:
+        index.close()
+    return 0
+
+
+def profile_command(args):
+    """Компилирует вакансию в профиль для повторного использования"""
+    with open(args.job, encoding="utf-8") as job_file:
+        profile = compile_vacancy(job_file.read())
+    profile.save(args.out)
+    print(
+        f"Профиль сохранен в {args.out}: предложений {len(profile.sentences)}, "
+        f"навыков {len(profile.skills)}, обязанностей {len(profile.responsibilities)}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def find_jobs(directory):
+    """Вакансии каталога: текстовые файлы (.txt) и профили (.npz)"""
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith((".txt", ".npz"))
+    )
+
+
+def match_command(args):
+    """Матрица соответствия всех вакансий каталога всем резюме"""
+    jobs = [(path, load_job(path)) for path in find_jobs(args.jobs)]
+    resumes = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for path, text, error in executor.map(
+            extract_path, find_resumes(args.resumes), chunksize=4
+        ):
+            if error is not None:
+                print(f"Пропущен {path}: {error}", file=sys.stderr)
+            else:
+                resumes.append((path, text))
+    print(f"Вакансий: {len(jobs)}, резюме: {len(resumes)}", file=sys.stderr)
+
+    def progress(done, total):
+        print(f"Обработано: {done}/{total}", file=sys.stderr)
+
+    matrix = score_matrix(
+        jobs,
+        resumes,
+        block_sentences=args.block_sentences,
+        batch_size=args.batch_size,
+        progress=progress,
+    )
+    matrix.save(args.out, k=args.k)
+    print(
+        f"Готово: матрица {len(jobs)}×{len(resumes)} записана в {args.out}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="hr_assistant", description="HR Assistant: оценка резюме без браузера"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    screen = commands.add_parser(
+        "screen", help="ранжировать каталог резюме по вакансии"
+    )
+    screen.add_argument(
+        "--job", required=True, help="файл с текстом вакансии или профиль (.npz)"
+    )
+    screen.add_argument("--resumes", required=True, help="каталог с PDF/DOCX резюме")
+    screen.add_argument("--out", required=True, help="выходной файл .jsonl или .csv")
+    screen.add_argument("--format", choices=["jsonl", "csv"], help="формат вывода")
+    screen.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="процессов для разбора файлов",
+    )
+    screen.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help="сколько резюме кодировать и записывать за раз",
+    )
+    screen.add_argument(
+        "--batch-size", type=int, default=BATCH_SIZE, help="текстов за вызов энкодера"
+    )
+    screen.add_argument(
+        "--top-k",
+        type=int,
+        help="каскад: нейросетевая оценка только K лучших по лексике",
+    )
+    screen.add_argument(
+        "--min-lexical",
+        type=float,
+        help="каскад: оценивать также резюме с лексической оценкой не ниже (0..1)",
+    )
+    screen.add_argument(
+        "--lexical-method",
+        choices=["tfidf", "bm25"],
+        default="tfidf",
+        help="метод лексического отбора",
+    )
+    screen.add_argument(
+        "--recall-report",
+        help="каскад: сравнить с полным скринингом и сохранить отчет (JSON)",
+    )
+    screen.set_defaults(func=screen_command)
+
+    profile = commands.add_parser("profile", help="скомпилировать профиль вакансии")
+    profile.add_argument("--job", required=True, help="файл с текстом вакансии")
+    profile.add_argument("--out", required=True, help="файл профиля (.npz)")
+    profile.set_defaults(func=profile_command)
+
+    match = commands.add_parser(
+        "match", help="сопоставить много вакансий с многими резюме"
+    )
+    match.add_argument(
+        "--jobs", required=True, help="каталог вакансий (.txt или профили .npz)"
+    )
+    match.add_argument("--resumes", required=True, help="каталог с PDF/DOCX резюме")
+    match.add_argument(
+        "--out",
+        required=True,
+        help="файл матрицы .npy или .parquet (рядом — JSON с top-k)",
+    )
+    match.add_argument(
+        "-k", type=int, default=10, help="лучших пар на строку и столбец"
+    )
+    match.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="процессов для разбора файлов",
+    )
+    match.add_argument(
+        "--block-sentences",
+        type=int,
+        default=BLOCK_SENTENCES,
+        help="предложений резюме в одном блоке (ограничивает память)",
+    )
+    match.add_argument(
+        "--batch-size", type=int, default=BATCH_SIZE, help="текстов за вызов энкодера"
+    )
+    match.set_defaults(func=match_command)
+
+    index = commands.add_parser("index", help="постоянный индекс резюме для поиска")
+    actions = index.add_subparsers(dest="action", required=True)
+    index_add = actions.add_parser("add", help="добавить резюме из каталога")
+    index_add.add_argument("--resumes", required=True, help="каталог с PDF/DOCX резюме")
+    index_add.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="процессов для разбора файлов",
+    )
+    index_delete = actions.add_parser("delete", help="удалить резюме из индекса")
+    index_delete.add_argument("ids", nargs="+", help="идентификаторы (пути) резюме")
+    index_ivf = actions.add_parser("build-ivf", help="построить кластеры IVF")
+    index_ivf.add_argument(
+        "--lists", type=int, help="число кластеров (по умолчанию √N)"
+    )
+    index_search = actions.add_parser("search", help="найти кандидатов под вакансию")
+    index_search.add_argument(
+        "--job", required=True, help="файл с текстом вакансии или профиль (.npz)"
+    )
+    index_search.add_argument("-k", type=int, default=10, help="сколько резюме вернуть")
+    index_search.add_argument("--section", help="искать по секции резюме")
+    index_search.add_argument(
+        "--probe", type=int, help="число кластеров IVF для приблизительного поиска"
+    )
+    for action in (index_add, index_delete, index_ivf, index_search):
+        action.add_argument("--index", required=True, help="каталог индекса")
+    index.set_defaults(func=index_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
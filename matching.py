@@ -0,0 +1,185 @@
+"""Матрица соответствия: много вакансий × много резюме
+
+Каждая вакансия компилируется один раз (VacancyProfile), резюме кодируются
+блоками. Для каждого блока считается одно матричное произведение
+предложений всех вакансий на предложения резюме блока, поэтому память
+ограничена (предложения вакансий) × block_sentences, а не M × N × предложения.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from screening import BATCH_SIZE, encode_in_batches
+from similarity import normalize_rows, top_k
+from utils import compile_vacancy, extract_skills, sent_tokenize
+
+# Сколько предложений резюме обрабатывать за один блок
+BLOCK_SENTENCES = 4096
+
+
+def _resume_blocks(resumes, block_sentences):
+    """Группирует резюме в блоки примерно по block_sentences предложений
+
+    Отдает списки (индекс, предложения, навыки); резюме не делятся между блоками.
+    """
+    block = []
+    size = 0
+    for index, (_, text) in enumerate(resumes):
+        sentences = sent_tokenize(text)
+        if block and size + len(sentences) > block_sentences:
+            yield block
+            block = []
+            size = 0
+        block.append((index, sentences, extract_skills(text)))
+        size += len(sentences)
+    if block:
+        yield block
+
+
+class ScoreMatrix:
+    """Результат сопоставления: схожесть и число совпавших навыков для каждой пары"""
+
+    def __init__(self, jobs, resumes, similarity, skill_overlap, job_skill_counts):
+        self.jobs = jobs
+        self.resumes = resumes
+        self.similarity = similarity
+        self.skill_overlap = skill_overlap
+        self.job_skill_counts = job_skill_counts
+
+    def top_resumes(self, k: int) -> dict:
+        """k лучших резюме для каждой вакансии"""
+        return {
+            job: self._entries(row, self.resumes, self.skill_overlap[i], k)
+            for i, (job, row) in enumerate(zip(self.jobs, self.similarity))
+        }
+
+    def top_jobs(self, k: int) -> dict:
+        """k наиболее подходящих вакансий для каждого резюме"""
+        return {
+            resume: self._entries(column, self.jobs, self.skill_overlap[:, j], k)
+            for j, (resume, column) in enumerate(zip(self.resumes, self.similarity.T))
+        }
+
+    @staticmethod
+    def _entries(scores, names, overlap, k):
+        return [
+            {
+                "name": names[i],
+                "score": float(scores[i]),
+                "skill_overlap": int(overlap[i]),
+            }
+            for i in top_k(scores, k)
+        ]
+
+    def save(self, path, k: int = 10):
+        """Сохраняет матрицу (.npy или .parquet) и рядом JSON с подписями и top-k
+
+        Для .npy в файл пишется матрица схожести, а совпадения навыков — в
+        <имя>.skills.npy. Для .parquet пишется длинная таблица
+        (вакансия, резюме, схожесть, совпавшие навыки).
+        """
+        stem, extension = os.path.splitext(path)
+        if extension == ".parquet":
+            import pandas as pd
+
+            table = pd.DataFrame(
+                {
+                    "job": np.repeat(self.jobs, len(self.resumes)),
+                    "resume": np.tile(self.resumes, len(self.jobs)),
+                    "similarity": self.similarity.ravel(),
+                    "skill_overlap": self.skill_overlap.ravel(),
+                }
+            )
+            table.to_parquet(path, index=False)
+        elif extension == ".npy":
+            np.save(path, self.similarity)
+            np.save(f"{stem}.skills.npy", self.skill_overlap)
+        else:
+            raise ValueError("Поддерживаются форматы .npy и .parquet")
+
+        summary = {
+            "jobs": self.jobs,
+            "resumes": self.resumes,
+            "job_skill_counts": self.job_skill_counts.tolist(),
+            "top_resumes_per_job": self.top_resumes(k),
+            "top_jobs_per_resume": self.top_jobs(k),
+        }
+        with open(f"{stem}.json", "w", encoding="utf-8") as out:
+            json.dump(summary, out, ensure_ascii=False, indent=2)
+
+
+def score_matrix(
+    jobs,
+    resumes,
+    block_sentences: int = BLOCK_SENTENCES,
+    batch_size: int = BATCH_SIZE,
+    progress=None,
+) -> ScoreMatrix:
+    """Сопоставляет каждую вакансию с каждым резюме
+
+    jobs — пары (имя, текст или VacancyProfile), resumes — пары (имя, текст).
+    Схожесть — та же, что в calculate_similarity: среднее по предложениям
+    вакансии от максимальной схожести с предложениями резюме, в процентах.
+    progress(done, total) вызывается после каждого блока резюме.
+    """
+    profiles = [compile_vacancy(job) for _, job in jobs]
+    m, n = len(profiles), len(resumes)
+    similarity = np.zeros((m, n), dtype=np.float32)
+    skill_overlap = np.zeros((m, n), dtype=np.int32)
+
+    # Предложения всех вакансий одной матрицей; вакансии без предложений пропускаем
+    scored = [i for i, profile in enumerate(profiles) if len(profile.sentence_vectors)]
+    counts = np.array([len(profiles[i].sentence_vectors) for i in scored])
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    if scored:
+        job_vectors = np.vstack([profiles[i].sentence_vectors for i in scored])
+
+    # Навыки вакансий — бинарная матрица по общему словарю навыков вакансий
+    vocabulary = {
+        skill: column
+        for column, skill in enumerate(
+            sorted(set().union(*(p.skills for p in profiles)))
+        )
+    }
+    job_skills = np.zeros((m, len(vocabulary)), dtype=np.float32)
+    for i, profile in enumerate(profiles):
+        job_skills[i, [vocabulary[skill] for skill in profile.skills]] = 1.0
+
+    done = 0
+    for block in _resume_blocks(resumes, block_sentences):
+        indices = np.array([index for index, _, _ in block])
+        resume_skills = np.zeros((len(block), len(vocabulary)), dtype=np.float32)
+        for row, (_, _, skills) in enumerate(block):
+            resume_skills[row, [vocabulary[s] for s in skills if s in vocabulary]] = 1.0
+        skill_overlap[:, indices] = (job_skills @ resume_skills.T).astype(np.int32)
+
+        # Резюме без предложений получают нулевую схожесть
+        nonempty = [(index, sentences) for index, sentences, _ in block if sentences]
+        if scored and nonempty:
+            texts = [sentence for _, sentences in nonempty for sentence in sentences]
+            embeddings = encode_in_batches(texts, batch_size)
+            resume_vectors = normalize_rows([embeddings[text] for text in texts])
+            lengths = [len(sentences) for _, sentences in nonempty]
+            resume_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(
+                np.int64
+            )
+            # (предложения вакансий × предложения блока) → максимум по каждому резюме
+            maxima = np.maximum.reduceat(
+                job_vectors @ resume_vectors.T, resume_starts, axis=1
+            )
+            # Среднее по предложениям каждой вакансии
+            means = np.add.reduceat(maxima, starts, axis=0) / counts[:, None]
+            similarity[np.ix_(scored, [index for index, _ in nonempty])] = means * 100
+        done += len(block)
+        if progress is not None:
+            progress(done, n)
+
+    return ScoreMatrix(
+        [name for name, _ in jobs],
+        [name for name, _ in resumes],
+        similarity,
+        skill_overlap,
+        np.array([len(profile.skills) for profile in profiles]),
+    )
@@ -0,0 +1,153 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Включен ли сбор метрик (по умолчанию выключен и почти ничего не стоит)
+ENABLED = os.environ.get("HR_ASSISTANT_METRICS", "0") == "1"
+
+# Необязательный JSONL-журнал метрик по запросам
+METRICS_LOG = os.environ.get("HR_ASSISTANT_METRICS_LOG")
+
+# Сборщик метрик текущего запроса (свой в каждом потоке/контексте)
+_current = contextvars.ContextVar("hr_assistant_metrics", default=None)
+
+# Источники счетчиков (например, статистика кэша эмбеддингов): имя -> функция
+_stats_sources = {}
+
+
+def register_stats_source(name, stats):
+    """Регистрирует функцию, возвращающую словарь счетчиков для снимков до/после запроса"""
+    _stats_sources[name] = stats
+
+
+def _peak_rss_mb():
+    """Пиковое потребление памяти процессом, МБ (None, если недоступно)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS ru_maxrss в байтах, на Linux — в килобайтах
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+
+class RequestMetrics:
+    """Метрики одного запроса: время функций, счетчики и размеры документов"""
+
+    def __init__(self, name):
+        self.name = name
+        self.functions = {}
+        self.counters = {}
+        self.sizes = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._started_at = time.time()
+        self._stats_before = {name: stats() for name, stats in _stats_sources.items()}
+
+    def add_time(self, function, seconds):
+        with self._lock:
+            entry = self.functions.setdefault(function, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+
+    def increment(self, counter, value=1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def record_size(self, name, value):
+        with self._lock:
+            self.sizes[name] = value
+
+    def _stats_delta(self):
+        """Изменение счетчиков источников за время запроса"""
+        result = {}
+        for name, stats in _stats_sources.items():
+            before = self._stats_before.get(name, {})
+            after = stats()
+            hits = after.get("hits", 0) - before.get("hits", 0)
+            misses = after.get("misses", 0) - before.get("misses", 0)
+            result[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return result
+
+    def as_dict(self) -> dict:
+        return {
+            "request": self.name,
+            "started_at": self._started_at,
+            "wall_seconds": time.perf_counter() - self._started,
+            "functions": self.functions,
+            "counters": self.counters,
+            "sizes": self.sizes,
+            "caches": self._stats_delta(),
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+
+
+@contextmanager
+def collect_metrics(name="request"):
+    """Собирает метрики запроса; отдает словарь-результат (пустой, если сбор выключен)
+
+    Пример:
+        with collect_metrics("analysis") as request_metrics:
+            analyze(...)
+        request_metrics  # заполняется при выходе из блока
+    """
+    result = {}
+    if not ENABLED:
+        yield result
+        return
+    collector = RequestMetrics(name)
+    token = _current.set(collector)
+    try:
+        yield result
+    finally:
+        _current.reset(token)
+        result.update(collector.as_dict())
+        if METRICS_LOG:
+            try:
+                with open(METRICS_LOG, "a", encoding="utf-8") as log:
+                    log.write(json.dumps(result, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"Ошибка при записи журнала метрик: {str(e)}")
+
+
+def timed(func):
+    """Декоратор: учитывает время вызова функции в метриках текущего запроса"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        collector = _current.get()
+        if collector is None:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            collector.add_time(name, time.perf_counter() - started)
+
+    return wrapper
+
+
+def increment(counter, value=1):
+    """Увеличивает счетчик текущего запроса (если метрики собираются)"""
+    collector = _current.get()
+    if collector is not None:
+        collector.increment(counter, value)
+
+
+def record_size(name, value):
+    """Записывает размер документа или другого объема в метрики текущего запроса"""
+    collector = _current.get()
+    if collector is not None:
+        collector.record_size(name, value)
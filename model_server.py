@@ -0,0 +1,297 @@
+"""Сервер модели: один процесс держит энкодер, воркеры приложения подключаются к нему
+
+Запуск:
+    python model_server.py --socket /tmp/hr_assistant.sock [--backend onnx]
+    HR_ASSISTANT_MODEL_SERVER=/tmp/hr_assistant.sock streamlit run app.py
+
+Запросы всех клиентов объединяются в батчи (EmbeddingBatcher). Большие
+результаты передаются через разделяемую память, маленькие — в сообщении.
+Ключ соединений — HR_ASSISTANT_MODEL_SERVER_KEY или случайный, из <сокет>.key.
+Для тестов есть заглушка без весов: --stand-in.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import secrets
+import signal
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from batcher import EmbeddingBatcher
+
+# Ключ аутентификации соединений. Если не задан, сервер при каждом запуске
+# создает случайный и записывает его в <сокет>.key с правами 0600
+AUTHKEY_ENV = "HR_ASSISTANT_MODEL_SERVER_KEY"
+
+# Результаты меньше этого размера передаются прямо в сообщении
+SHM_MIN_BYTES = 64 * 1024
+
+
+class HashingEncoder:
+    """Заглушка энкодера для тестов: детерминированный мешок слов без весов модели"""
+
+    version = "stand-in"
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        result = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                digest = hashlib.md5(word.encode("utf-8")).digest()
+                column = int.from_bytes(digest[:4], "little") % self.dimension
+                result[row, column] += 1.0
+        return result[0] if single else result
+
+
+def key_path(address) -> str:
+    """Файл с ключом сервера, слушающего address"""
+    return f"{address}.key"
+
+
+def _create_authkey(address) -> bytes:
+    """Ключ из HR_ASSISTANT_MODEL_SERVER_KEY или новый случайный в файле рядом с сокетом"""
+    key = os.environ.get(AUTHKEY_ENV)
+    if key:
+        return key.encode("utf-8")
+    path = key_path(address)
+    if os.path.exists(path):
+        os.unlink(path)
+    key = secrets.token_hex(32)
+    # Файл создается сразу с правами 0600, чтобы ключ не был виден другим пользователям
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(key)
+    return key.encode("utf-8")
+
+
+def _read_authkey(address) -> bytes:
+    """Ключ из HR_ASSISTANT_MODEL_SERVER_KEY или из файла, созданного сервером"""
+    key = os.environ.get(AUTHKEY_ENV)
+    if key:
+        return key.encode("utf-8")
+    path = key_path(address)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip().encode("utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Не найден ключ сервера модели {path}; задайте {AUTHKEY_ENV} "
+            "или запустите сервер от того же пользователя"
+        ) from None
+
+
+def _attach(name):
+    """Подключается к разделяемой памяти сервера, не передавая ее учет этому процессу"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class ModelServer:
+    """Обслуживает запросы кодирования по Unix-сокету"""
+
+    def __init__(self, address, encoder, version, authkey=None, batcher=None):
+        self.address = address
+        self.encoder = encoder
+        self.version = version
+        self.batcher = batcher or EmbeddingBatcher(encoder.encode)
+        if os.path.exists(address):
+            os.unlink(address)
+        self._key_file = authkey is None and not os.environ.get(AUTHKEY_ENV)
+        if authkey is None:
+            authkey = _create_authkey(address)
+        self.listener = Listener(address, family="AF_UNIX", authkey=authkey)
+        os.chmod(address, 0o600)
+        self._closed = threading.Event()
+
+    def serve_forever(self):
+        while not self._closed.is_set():
+            try:
+                connection = self.listener.accept()
+            except OSError:
+                if self._closed.is_set():
+                    return
+                raise
+            except Exception as e:
+                # Например, клиент с неверным ключом
+                print(f"Ошибка при подключении клиента: {str(e)}")
+                continue
+            threading.Thread(
+                target=self._handle, args=(connection,), daemon=True
+            ).start()
+
+    def start(self) -> threading.Thread:
+        """Запускает сервер в фоновом потоке (удобно для тестов)"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def _handle(self, connection):
+        """Обслуживает одного клиента; буфер разделяемой памяти переиспользуется"""
+        buffer = None
+        try:
+            while True:
+                try:
+                    command, payload = connection.recv()
+                except EOFError:
+                    return
+                if command == "info":
+                    dimension = self.encoder.get_sentence_embedding_dimension()
+                    info = {"version": self.version, "dimension": dimension}
+                    connection.send(("ok", info))
+                elif command == "encode":
+                    try:
+                        vectors = np.ascontiguousarray(
+                            self.batcher.encode_batch(payload), dtype=np.float32
+                        )
+                    except Exception as e:
+                        connection.send(("error", str(e)))
+                        continue
+                    if vectors.nbytes < SHM_MIN_BYTES:
+                        connection.send(("inline", vectors))
+                        continue
+                    if buffer is None or buffer.size < vectors.nbytes:
+                        if buffer is not None:
+                            buffer.close()
+                            buffer.unlink()
+                        buffer = shared_memory.SharedMemory(
+                            create=True, size=vectors.nbytes * 2
+                        )
+                    np.ndarray(vectors.shape, np.float32, buffer.buf)[:] = vectors
+                    connection.send(("shm", (buffer.name, vectors.shape)))
+                else:
+                    connection.send(("error", f"Неизвестная команда: {command}"))
+        finally:
+            connection.close()
+            if buffer is not None:
+                buffer.close()
+                buffer.unlink()
+
+    def close(self):
+        self._closed.set()
+        self.listener.close()
+        self.batcher.close()
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        if self._key_file and os.path.exists(key_path(self.address)):
+            os.unlink(key_path(self.address))
+
+
+class ModelClient:
+    """Клиент сервера модели с интерфейсом SentenceTransformer.encode"""
+
+    def __init__(self, address, authkey=None):
+        self.address = address
+        if authkey is None:
+            authkey = _read_authkey(address)
+        self._connection = Client(address, family="AF_UNIX", authkey=authkey)
+        self._lock = threading.Lock()
+        self._buffer = None
+        _, info = self._request("info", None)
+        self.version = info["version"]
+        self.dimension = info["dimension"]
+
+    def _request(self, command, payload):
+        self._connection.send((command, payload))
+        status, result = self._connection.recv()
+        if status == "error":
+            raise RuntimeError(f"Ошибка сервера модели: {result}")
+        return status, result
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        with self._lock:
+            status, result = self._request("encode", texts)
+            if status == "inline":
+                vectors = result
+            else:
+                name, shape = result
+                if self._buffer is None or self._buffer.name != name:
+                    if self._buffer is not None:
+                        self._buffer.close()
+                    self._buffer = _attach(name)
+                # Копируем до следующего запроса: сервер переиспользует буфер
+                vectors = np.ndarray(shape, np.float32, self._buffer.buf).copy()
+        return vectors[0] if single else vectors
+
+    def close(self):
+        with self._lock:
+            if self._buffer is not None:
+                self._buffer.close()
+                self._buffer = None
+            self._connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервер модели HR Assistant")
+    parser.add_argument("--socket", required=True, help="путь к Unix-сокету")
+    parser.add_argument("--backend", help="бэкенд энкодера (как HR_ASSISTANT_BACKEND)")
+    parser.add_argument(
+        "--stand-in", action="store_true", help="заглушка без весов модели (для тестов)"
+    )
+    args = parser.parse_args(argv)
+
+    # Сервер сам загружает модель, а не подключается к другому серверу
+    os.environ.pop("HR_ASSISTANT_MODEL_SERVER", None)
+    if args.backend:
+        os.environ["HR_ASSISTANT_BACKEND"] = args.backend
+    from utils import (
+        BATCHER_MAX_BATCH,
+        BATCHER_MAX_QUEUE,
+        BATCHER_MAX_WAIT_MS,
+        get_model,
+        get_model_version,
+    )
+
+    if args.stand_in:
+        encoder = HashingEncoder()
+        version = HashingEncoder.version
+    else:
+        encoder = get_model()
+        if encoder is None:
+            return 1
+        version = get_model_version()
+
+    batcher = EmbeddingBatcher(
+        encoder.encode,
+        max_batch=BATCHER_MAX_BATCH,
+        max_wait=BATCHER_MAX_WAIT_MS / 1000,
+        max_queue=BATCHER_MAX_QUEUE,
+    )
+    server = ModelServer(args.socket, encoder, version, batcher=batcher)
+    print(f"Сервер модели {version} слушает {args.socket}", flush=True)
+    # SIGTERM завершает сервер так же, как Ctrl+C: сокет и файл ключа удаляются
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+import numpy as np
+
+from extraction import iter_sentences, iter_text_chunks, prefetch
+from metrics import increment, record_size, timed
+from result_store import get_result_store
+from similarity import max_similarity, threshold_match
+from text_processing import get_document
+from utils import (
+    VacancyProfile,
+    _build_section_analysis,
+    _responsibility_candidates,
+    _select_responsibilities,
+    _split_sections,
+    encode_texts,
+    extract_skills,
+    get_model,
+    sent_tokenize,
+    vacancy_text,
+)
+
+# Этапы анализа, о которых сообщает progress(stage, done, total)
+STAGES = ("extraction", "segmentation", "encoding", "skills", "sections")
+
+
+def _report(progress, stage, done, total=None):
+    """Сообщает о ходе этапа, если передан обработчик прогресса"""
+    if progress is not None:
+        progress(stage, done, total)
+
+
+@timed
+def extract_and_encode(file, batch_size: int = 64, progress=None) -> str:
+    """Извлекает текст потоково и кодирует готовые предложения, не дожидаясь конца файла
+
+    Эмбеддинги попадают в общий кэш, поэтому последующий анализ документа
+    почти не обращается к модели.
+    """
+    chunks = []
+
+    def collect(stream):
+        for chunk in stream:
+            chunks.append(chunk)
+            _report(progress, "extraction", len(chunks))
+            yield chunk
+
+    stream = collect(prefetch(iter_text_chunks(file)))
+    if get_model() is None:
+        return "".join(stream)
+
+    batch = []
+    batches = 0
+    for sentence in iter_sentences(stream, sent_tokenize):
+        batch.append(sentence)
+        if len(batch) >= batch_size:
+            encode_texts(batch)
+            batches += 1
+            _report(progress, "encoding", batches)
+            batch = []
+    if batch:
+        encode_texts(batch)
+        _report(progress, "encoding", batches + 1)
+    record_size("extracted_chars", sum(len(chunk) for chunk in chunks))
+    return "".join(chunks)
+
+
+class DocumentContext:
+    """Документ, разбитый на предложения один раз, с эмбеддингами всех нужных фрагментов"""
+
+    def __init__(self, text, previous=None):
+        self.text = text
+        document = get_document(text)
+        self.sentences = document.sentences
+        self.candidates = _responsibility_candidates(document.lower_sentences)
+        self.skills = extract_skills(text)
+        self._embeddings = {}
+        if previous is not None:
+            # Переносим эмбеддинги предложений, которые не изменились
+            needed = {*self.sentences, *self.candidates, text}
+            self._embeddings = {
+                key: value
+                for key, value in previous._embeddings.items()
+                if key in needed
+            }
+
+    @classmethod
+    def from_profile(cls, profile):
+        """Контекст вакансии из VacancyProfile: все эмбеддинги уже посчитаны
+
+        Кандидатами в обязанности служат уже отобранные обязанности профиля:
+        повторный отбор дубликатов оставляет их без изменений.
+        """
+        context = cls.__new__(cls)
+        context.text = profile.text
+        context.sentences = list(profile.sentences)
+        context.candidates = list(profile.responsibilities)
+        context.skills = set(profile.skills)
+        context._embeddings = {
+            **dict(zip(profile.sentences, profile.sentence_vectors)),
+            **dict(zip(profile.responsibilities, profile.responsibility_vectors)),
+            profile.text: profile.document_vector,
+        }
+        return context
+
+    def encode(self, extra_texts=(), on_batch=None):
+        """Кодирует предложения, кандидатов в обязанности и доп. тексты одним вызовом"""
+        texts = list(dict.fromkeys([*self.sentences, *self.candidates, *extra_texts]))
+        texts = [text for text in texts if text not in self._embeddings]
+        if texts:
+            self._embeddings.update(zip(texts, encode_texts(texts, on_batch)))
+
+    def vectors(self, texts) -> np.ndarray:
+        """Возвращает эмбеддинги уже закодированных текстов в виде матрицы"""
+        return np.array([self._embeddings[text] for text in texts])
+
+
+class AnalysisContext:
+    """Однопроходный анализ: каждый документ сегментируется и кодируется один раз
+
+    Результаты, зависящие только от резюме, и построчные результаты для
+    предложений вакансии кэшируются, поэтому update_job() после правки
+    вакансии кодирует только новые или измененные предложения.
+    """
+
+    def __init__(self, job_description, resume_text, progress=None):
+        self.progress = progress
+        _report(progress, "segmentation", 0, 2)
+        self.job = self._job_context(job_description)
+        _report(progress, "segmentation", 1, 2)
+        self.resume = DocumentContext(resume_text)
+        self.section_texts, self.found_headers = _split_sections(resume_text)
+        # Кандидаты в обязанности внутри каждой непустой секции резюме
+        self.section_candidates = {
+            section: _responsibility_candidates(
+                get_document(section_text).lower_sentences
+            )
+            for section, section_text in self.section_texts.items()
+            if section_text.strip()
+        }
+        _report(progress, "segmentation", 2, 2)
+        record_size("job_sentences", len(self.job.sentences))
+        record_size("resume_sentences", len(self.resume.sentences))
+        record_size("section_headers", len(self.found_headers))
+        # Кэш по предложениям вакансии: максимальная схожесть с резюме и покрытие опытом
+        self._sentence_max = {}
+        self._covered = {}
+        self._resume_side = None
+        self._result = None
+
+    def _job_context(self, job_description, previous=None):
+        """Контекст вакансии из текста или готового VacancyProfile"""
+        if isinstance(job_description, VacancyProfile):
+            return DocumentContext.from_profile(job_description)
+        return DocumentContext(job_description, previous=previous)
+
+    def encode(self):
+        """Один проход энкодера на документ"""
+
+        def on_batch(done, total):
+            _report(self.progress, "encoding", done, total)
+
+        self.job.encode([self.job.text], on_batch)
+        section_extra = []
+        for section, candidates in self.section_candidates.items():
+            section_extra.append(self.section_texts[section])
+            section_extra.extend(candidates)
+        self.resume.encode(section_extra, on_batch)
+
+    def _resume_analysis(self):
+        """Части анализа, зависящие только от резюме (считаются один раз)"""
+        if self._resume_side is None:
+            resume_responsibilities = _select_responsibilities(
+                self.resume.candidates, self.resume.vectors(self.resume.candidates)
+            )
+            section_embeddings = {}
+            section_responsibilities = {}
+            for section, candidates in self.section_candidates.items():
+                section_embeddings[section] = self.resume.vectors(
+                    [self.section_texts[section]]
+                )[0]
+                section_responsibilities[section] = _select_responsibilities(
+                    candidates, self.resume.vectors(candidates)
+                )
+            self._resume_side = {
+                "sentence_vectors": self.resume.vectors(self.resume.sentences),
+                "responsibility_vectors": self.resume.vectors(resume_responsibilities),
+                "section_embeddings": section_embeddings,
+                "section_responsibilities": section_responsibilities,
+            }
+        return self._resume_side
+
+    def similarity(self) -> float:
+        """Общая семантическая схожесть вакансии и резюме, в процентах"""
+        resume_vectors = self._resume_analysis()["sentence_vectors"]
+        if not self.job.sentences or len(resume_vectors) == 0:
+            return 0.0
+        # Считаем строки матрицы схожести только для новых предложений вакансии
+        new_sentences = [
+            s for s in dict.fromkeys(self.job.sentences) if s not in self._sentence_max
+        ]
+        if new_sentences:
+            maxima = max_similarity(self.job.vectors(new_sentences), resume_vectors)
+            self._sentence_max.update(zip(new_sentences, maxima))
+        similarity = np.mean([self._sentence_max[s] for s in self.job.sentences])
+        return float(similarity * 100)
+
+    def skills_analysis(self) -> dict:
+        """Отсутствующие навыки и опыт (как в analyze_skills)"""
+        job_responsibilities = _select_responsibilities(
+            self.job.candidates, self.job.vectors(self.job.candidates)
+        )
+        new_responsibilities = [
+            r for r in job_responsibilities if r not in self._covered
+        ]
+        if new_responsibilities:
+            # Обязанность покрыта, если в резюме есть похожая (порог схожести 0.5)
+            covered = threshold_match(
+                self.job.vectors(new_responsibilities),
+                self._resume_analysis()["responsibility_vectors"],
+                0.5,
+            )
+            self._covered.update(zip(new_responsibilities, covered))
+        return {
+            "missing_skills": self.job.skills - self.resume.skills,
+            "missing_experience": [
+                r for r in job_responsibilities if not self._covered[r]
+            ],
+        }
+
+    def detailed_analysis(self) -> dict:
+        """Анализ по секциям резюме (как в get_detailed_analysis)"""
+        resume_side = self._resume_analysis()
+        analysis = _build_section_analysis(
+            self.section_texts,
+            self.job.vectors([self.job.text])[0],
+            resume_side["section_embeddings"],
+            resume_side["section_responsibilities"],
+        )
+        # Для отладки: возвращаем найденные заголовки
+        analysis["_debug_headers"] = self.found_headers
+        return analysis
+
+    def run(self) -> dict:
+        """Выполняет полный анализ и возвращает объединенный результат"""
+        self.encode()
+        _report(self.progress, "skills", 0, 1)
+        result = {"similarity": self.similarity(), **self.skills_analysis()}
+        _report(self.progress, "skills", 1, 1)
+        _report(self.progress, "sections", 0, 1)
+        result.update(self.detailed_analysis())
+        _report(self.progress, "sections", 1, 1)
+        self._result = result
+        return result
+
+    def update_job(self, job_description, progress=None) -> dict:
+        """Пересчитывает анализ для измененной вакансии, переиспользуя сторону резюме"""
+        self.progress = progress
+        job_text = vacancy_text(job_description)
+        if self._result is not None and job_text == self.job.text:
+            return self._result
+        _report(self.progress, "segmentation", 0, 1)
+        self.job = self._job_context(job_description, previous=self.job)
+        _report(self.progress, "segmentation", 1, 1)
+        return self.run()
+
+
+@timed
+def analyze(job_description, resume_text, state=None, progress=None) -> dict:
+    """Полный анализ резюме: схожесть, отсутствующие навыки/опыт и анализ секций
+
+    state — словарь, живущий между вызовами (например, st.session_state).
+    В нем хранится контекст резюме, и при правке вакансии пересчитываются
+    только изменившиеся предложения. Готовые результаты берутся из
+    постоянного хранилища без загрузки модели. progress(stage, done, total)
+    получает события этапов из STAGES. job_description может быть
+    VacancyProfile — тогда вакансия не сегментируется и не кодируется.
+    """
+    job_text = vacancy_text(job_description)
+    record_size("job_chars", len(job_text))
+    record_size("resume_chars", len(resume_text))
+    store = get_result_store()
+    if store is not None:
+        stored = store.get(job_text, resume_text)
+        if stored is not None:
+            increment("result_store_hits")
+            return stored
+
+    if get_model() is None:
+        print("Ошибка: модель не была загружена")
+        return {
+            "similarity": 0.0,
+            "missing_skills": extract_skills(job_text) - extract_skills(resume_text),
+            "missing_experience": [],
+        }
+
+    try:
+        if state is None:
+            result = AnalysisContext(job_description, resume_text, progress).run()
+        else:
+            context = state.get("analysis_context")
+            if context is None or context.resume.text != resume_text:
+                context = AnalysisContext(job_description, resume_text, progress)
+                state["analysis_context"] = context
+            result = context.update_job(job_description, progress)
+    except Exception as e:
+        print(f"Ошибка при анализе резюме: {str(e)}")
+        return {"similarity": 0.0, "missing_skills": set(), "missing_experience": []}
+
+    if store is not None:
+        store.put(job_text, resume_text, result)
+    return result
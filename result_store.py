@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import text_processing
+from utils import (
+    RESPONSIBILITY_KEYWORDS,
+    SECTIONS,
+    SKILL_STOP_WORDS,
+    TECH_SKILLS,
+    content_hash,
+    get_model_version,
+)
+
+# Версия формата сохраненных результатов; при изменении схемы старые записи игнорируются
+SCHEMA_VERSION = 1
+
+# Путь к базе результатов. В результатах есть данные кандидатов (опыт,
+# навыки), поэтому хранилище включается только явно
+RESULT_STORE_PATH = os.environ.get("HR_ASSISTANT_RESULT_DB", "")
+
+# Сколько дней хранить результаты; 0 — без ограничения
+RESULT_TTL_DAYS = float(os.environ.get("HR_ASSISTANT_RESULT_TTL_DAYS", "30"))
+
+
+def dictionaries_fingerprint() -> str:
+    """Отпечаток словарей и сегментатора предложений (меняется при их правке)
+
+    Сегментатор входит в отпечаток: от границ предложений зависят схожесть
+    и найденные обязанности.
+    """
+    payload = json.dumps(
+        {
+            "segmenter": text_processing.SEGMENTER,
+            "tech_skills": {k: sorted(v) for k, v in TECH_SKILLS.items()},
+            "responsibility_keywords": sorted(RESPONSIBILITY_KEYWORDS),
+            "skill_stop_words": sorted(SKILL_STOP_WORDS),
+            "sections": SECTIONS,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_value(value):
+    """Множества сохраняются как помеченные списки, чтобы восстановить их при чтении"""
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(value)}
+    raise TypeError(f"Неподдерживаемый тип: {type(value).__name__}")
+
+
+def _decode_value(obj):
+    if set(obj) == {"__set__"}:
+        return set(obj["__set__"])
+    return obj
+
+
+def serialize(result: dict) -> bytes:
+    """Компактная сериализация результата: JSON + zlib"""
+    payload = json.dumps(
+        result, default=_encode_value, ensure_ascii=False, separators=(",", ":")
+    )
+    return zlib.compress(payload.encode("utf-8"), 6)
+
+
+def deserialize(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8"), object_hook=_decode_value)
+
+
+class ResultStore:
+    """Хранилище результатов анализа в SQLite
+
+    Ключ — хэши текста вакансии и резюме, версия модели и отпечаток
+    словарей. Повторный запрос того же анализа возвращается из базы
+    без загрузки модели.
+    """
+
+    def __init__(self, db_path: str, ttl_days: float = RESULT_TTL_DAYS):
+        self.db_path = db_path
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "vacancy_hash TEXT NOT NULL, resume_hash TEXT NOT NULL, "
+            "model TEXT NOT NULL, dictionaries TEXT NOT NULL, "
+            "schema_version INTEGER NOT NULL, created_at REAL NOT NULL, "
+            "result BLOB NOT NULL, "
+            "PRIMARY KEY (vacancy_hash, resume_hash, model, dictionaries, schema_version))"
+        )
+        self._db.commit()
+        self._fingerprint = dictionaries_fingerprint()
+
+    def _key(self, job_description, resume_text):
+        return (
+            content_hash(job_description),
+            content_hash(resume_text),
+            get_model_version(),
+            self._fingerprint,
+            SCHEMA_VERSION,
+        )
+
+    def _expires_before(self) -> float:
+        if not self.ttl_days:
+            return 0.0
+        return time.time() - self.ttl_days * 86400
+
+    def get(self, job_description, resume_text):
+        """Сохраненный результат анализа или None (просроченные не возвращаются)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM results WHERE vacancy_hash = ? AND resume_hash = ? "
+                "AND model = ? AND dictionaries = ? AND schema_version = ? "
+                "AND created_at >= ?",
+                (*self._key(job_description, resume_text), self._expires_before()),
+            ).fetchone()
+        return deserialize(row[0]) if row else None
+
+    def put(self, job_description, resume_text, result: dict):
+        """Сохраняет результат анализа"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (vacancy_hash, resume_hash, model, "
+                "dictionaries, schema_version, created_at, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *self._key(job_description, resume_text),
+                    time.time(),
+                    serialize(result),
+                ),
+            )
+            self._db.commit()
+
+    def purge_stale(self) -> int:
+        """Удаляет просроченные записи и записи другой модели, словарей или схемы"""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM results WHERE model != ? OR dictionaries != ? "
+                "OR schema_version != ? OR created_at < ?",
+                (
+                    get_model_version(),
+                    self._fingerprint,
+                    SCHEMA_VERSION,
+                    self._expires_before(),
+                ),
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """Общее хранилище результатов процесса (None, если отключено или недоступно)"""
+    global _store
+    if _store is None and RESULT_STORE_PATH:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = ResultStore(RESULT_STORE_PATH)
+                    _store.purge_stale()
+                except sqlite3.Error as e:
+                    print(f"Ошибка при открытии хранилища результатов: {str(e)}")
+                    return None
+    return _store
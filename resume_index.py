@@ -0,0 +1,314 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from similarity import centroid, normalize_rows, top_k
+from utils import (
+    SECTIONS,
+    VacancyProfile,
+    _split_sections,
+    encode_texts,
+    extract_skills,
+    get_model_version,
+    sent_tokenize,
+)
+
+# Сколько строк матрицы векторов просматривать за один блок при поиске
+SEARCH_BLOCK_ROWS = 65536
+
+# Начальная емкость файла векторов (строк), дальше емкость удваивается
+INITIAL_CAPACITY = 1024
+
+RESUME_KIND = "resume"
+
+
+def document_vectors(text):
+    """Эмбеддинг всего резюме (центр предложений) и эмбеддинги его секций"""
+    sentences = sent_tokenize(text)
+    section_texts, _ = _split_sections(text)
+    section_texts = {k: v for k, v in section_texts.items() if v.strip()}
+    embeddings = encode_texts(sentences + list(section_texts.values()))
+    vectors = {RESUME_KIND: centroid(embeddings[: len(sentences)])}
+    for i, section in enumerate(section_texts):
+        vectors[section] = normalize_rows(embeddings[len(sentences) + i])[0]
+    return vectors
+
+
+class ResumeIndex:
+    """Постоянный индекс резюме для поиска кандидатов под вакансию
+
+    Векторы (резюме целиком и его секции) хранятся в отображаемой в память
+    матрице float32, метаданные и навыки — в SQLite. Добавление дописывает
+    строки в конец матрицы, удаление помечает их удаленными, поэтому
+    индекс не нужно перестраивать. Поиск по умолчанию точный (перебор
+    блоками); после build_ivf() можно искать только в ближайших кластерах.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            os.path.join(path, "index.sqlite"), check_same_thread=False
+        )
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS resumes (
+                resume_id TEXT PRIMARY KEY,
+                name TEXT,
+                skills TEXT,
+                metadata TEXT,
+                added_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS vectors (
+                row INTEGER PRIMARY KEY,
+                resume_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                list_id INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS vectors_resume ON vectors (resume_id);
+            """)
+        # Версия учитывает бэкенд и сервер модели: их эмбеддинги немного различаются
+        model_version = self._info("model")
+        current_version = get_model_version()
+        if model_version is not None and model_version != current_version:
+            raise ValueError(
+                f"Индекс построен моделью {model_version}, а загружена {current_version}"
+            )
+        dim = self._info("dim")
+        self.dim = int(dim) if dim is not None else None
+        self._vectors = None
+        self._rows = None
+        self._centroids = None
+        if self.dim is not None:
+            self._open_vectors()
+        centroids_path = os.path.join(path, "ivf_centroids.npy")
+        if os.path.exists(centroids_path):
+            self._centroids = np.load(centroids_path)
+
+    def _info(self, key):
+        row = self._db.execute(
+            "SELECT value FROM info WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_info(self, key, value):
+        self._db.execute(
+            "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.path, "vectors.f32")
+
+    def _open_vectors(self, capacity=None):
+        """Открывает (и при необходимости расширяет) файл векторов"""
+        row_bytes = self.dim * 4
+        current = (
+            os.path.getsize(self._vectors_path) // row_bytes
+            if os.path.exists(self._vectors_path)
+            else 0
+        )
+        capacity = max(capacity or 0, current, INITIAL_CAPACITY)
+        if capacity > current:
+            with open(self._vectors_path, "ab") as file:
+                file.truncate(capacity * row_bytes)
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+        )
+
+    def _active_rows(self, kind):
+        """Номера строк активных (не удаленных) векторов нужного вида"""
+        if self._rows is None:
+            self._rows = {}
+        if kind not in self._rows:
+            rows = self._db.execute(
+                "SELECT row, list_id FROM vectors WHERE kind = ? AND deleted = 0 ORDER BY row",
+                (kind,),
+            ).fetchall()
+            self._rows[kind] = (
+                np.array([r[0] for r in rows], dtype=np.int64),
+                np.array([-1 if r[1] is None else r[1] for r in rows], dtype=np.int64),
+            )
+        return self._rows[kind]
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def __contains__(self, resume_id):
+        return (
+            self._db.execute(
+                "SELECT 1 FROM resumes WHERE resume_id = ?", (resume_id,)
+            ).fetchone()
+            is not None
+        )
+
+    def add(self, resume_id, text, name=None, metadata=None):
+        """Добавляет (или заменяет) резюме в индексе"""
+        vectors = document_vectors(text)
+        skills = sorted(extract_skills(text))
+        with self._lock:
+            if self.dim is None:
+                self.dim = len(vectors[RESUME_KIND])
+                self._set_info("dim", self.dim)
+                self._set_info("model", get_model_version())
+                self._open_vectors()
+            self._delete(resume_id)
+
+            next_row = self._db.execute(
+                "SELECT COALESCE(MAX(row) + 1, 0) FROM vectors"
+            ).fetchone()[0]
+            if next_row + len(vectors) > len(self._vectors):
+                self._vectors.flush()
+                self._open_vectors(capacity=2 * (next_row + len(vectors)))
+
+            for offset, (kind, vector) in enumerate(vectors.items()):
+                row = next_row + offset
+                self._vectors[row] = vector
+                self._db.execute(
+                    "INSERT INTO vectors (row, resume_id, kind, list_id) VALUES (?, ?, ?, ?)",
+                    (row, resume_id, kind, self._nearest_list(vector)),
+                )
+            self._db.execute(
+                "INSERT INTO resumes (resume_id, name, skills, metadata, added_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    resume_id,
+                    name or resume_id,
+                    json.dumps(skills, ensure_ascii=False),
+                    json.dumps(metadata or {}, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+            self._vectors.flush()
+            self._db.commit()
+            self._rows = None
+
+    def _delete(self, resume_id):
+        cursor = self._db.execute(
+            "DELETE FROM resumes WHERE resume_id = ?", (resume_id,)
+        )
+        self._db.execute(
+            "UPDATE vectors SET deleted = 1 WHERE resume_id = ?", (resume_id,)
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, resume_id) -> bool:
+        """Удаляет резюме из индекса (строки векторов помечаются удаленными)"""
+        with self._lock:
+            deleted = self._delete(resume_id)
+            self._db.commit()
+            self._rows = None
+        return deleted
+
+    def _nearest_list(self, vector):
+        """Номер ближайшего кластера IVF (None, если IVF не построен)"""
+        if self._centroids is None:
+            return None
+        return int(np.argmax(self._centroids @ vector))
+
+    def build_ivf(self, n_lists=None):
+        """Строит кластеры IVF по векторам резюме для приблизительного поиска"""
+        from sklearn.cluster import KMeans
+
+        with self._lock:
+            rows, _ = self._active_rows(RESUME_KIND)
+            if len(rows) == 0:
+                return
+            n_lists = n_lists or max(1, int(np.sqrt(len(rows))))
+            n_lists = min(n_lists, len(rows))
+            kmeans = KMeans(n_clusters=n_lists, n_init=1, random_state=0)
+            kmeans.fit(np.asarray(self._vectors[rows]))
+            self._centroids = normalize_rows(kmeans.cluster_centers_)
+            np.save(os.path.join(self.path, "ivf_centroids.npy"), self._centroids)
+
+            # Назначаем кластеры всем активным строкам (включая секции)
+            all_rows = [
+                r[0]
+                for r in self._db.execute("SELECT row FROM vectors WHERE deleted = 0")
+            ]
+            for start in range(0, len(all_rows), SEARCH_BLOCK_ROWS):
+                block = all_rows[start : start + SEARCH_BLOCK_ROWS]
+                lists = np.argmax(
+                    np.asarray(self._vectors[block]) @ self._centroids.T, axis=1
+                )
+                self._db.executemany(
+                    "UPDATE vectors SET list_id = ? WHERE row = ?",
+                    [(int(list_id), int(row)) for list_id, row in zip(lists, block)],
+                )
+            self._db.commit()
+            self._rows = None
+
+    def _scan(self, query, rows, k):
+        """Точный поиск k лучших строк перебором блоками"""
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for start in range(0, len(rows), SEARCH_BLOCK_ROWS):
+            block = rows[start : start + SEARCH_BLOCK_ROWS]
+            scores = np.asarray(self._vectors[block]) @ query
+            candidates = top_k(scores, k)
+            best_rows = np.concatenate([best_rows, block[candidates]])
+            best_scores = np.concatenate([best_scores, scores[candidates]])
+            keep = top_k(best_scores, k)
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+        return best_rows, best_scores
+
+    def search(self, job_description, k: int = 10, section=None, n_probe=None):
+        """Находит k резюме, наиболее подходящих под вакансию
+
+        section — искать по векторам одной секции ("experience", "skills", ...)
+        вместо резюме целиком. n_probe — число ближайших кластеров IVF для
+        приблизительного поиска (по умолчанию поиск точный).
+        """
+        kind = section or RESUME_KIND
+        if kind != RESUME_KIND and kind not in SECTIONS:
+            raise ValueError(f"Неизвестная секция: {section}")
+        if self.dim is None:
+            return []
+
+        if isinstance(job_description, VacancyProfile):
+            query = centroid(job_description.sentence_vectors)
+            job_skills = job_description.skills
+        else:
+            query = centroid(encode_texts(sent_tokenize(job_description)))
+            job_skills = extract_skills(job_description)
+
+        with self._lock:
+            rows, lists = self._active_rows(kind)
+            if n_probe and self._centroids is not None:
+                probe = top_k(self._centroids @ query, n_probe)
+                rows = rows[np.isin(lists, probe)]
+            best_rows, best_scores = self._scan(query, rows, k)
+
+            results = []
+            for row, score in zip(best_rows, best_scores):
+                (resume_id,) = self._db.execute(
+                    "SELECT resume_id FROM vectors WHERE row = ?", (int(row),)
+                ).fetchone()
+                name, skills, metadata = self._db.execute(
+                    "SELECT name, skills, metadata FROM resumes WHERE resume_id = ?",
+                    (resume_id,),
+                ).fetchone()
+                skills = set(json.loads(skills))
+                results.append(
+                    {
+                        "resume_id": resume_id,
+                        "name": name,
+                        "score": float(score * 100),
+                        "skills": sorted(skills),
+                        "missing_skills": sorted(job_skills - skills),
+                        "metadata": json.loads(metadata),
+                    }
+                )
+        return results
+
+    def close(self):
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._db.close()
@@ -0,0 +1,137 @@
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from similarity import mean_max_similarity, normalize_rows
+from utils import (
+    SECTIONS,
+    _split_sections,
+    compile_vacancy,
+    encode_texts,
+    extract_skills,
+    extract_text_from_file,
+    sent_tokenize,
+)
+
+# Сколько текстов отправлять в энкодер за один вызов
+BATCH_SIZE = 512
+
+# Число потоков для извлечения текста из файлов
+EXTRACT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+def iter_zip_resumes(zip_file):
+    """Перебирает PDF/DOCX файлы внутри zip-архива как именованные файловые объекты"""
+    with zipfile.ZipFile(zip_file) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(
+                SUPPORTED_EXTENSIONS
+            ):
+                continue
+            file = io.BytesIO(archive.read(info))
+            file.name = info.filename
+            yield file
+
+
+def expand_uploads(files):
+    """Раскрывает zip-архивы в список отдельных файлов резюме"""
+    result = []
+    for file in files:
+        if file.name.lower().endswith(".zip"):
+            result.extend(iter_zip_resumes(file))
+        else:
+            result.append(file)
+    return result
+
+
+def _extract(file):
+    """Извлекает текст одного файла, не прерывая весь пакет при ошибке"""
+    try:
+        return file.name, extract_text_from_file(file), None
+    except Exception as e:
+        return file.name, "", str(e)
+
+
+def extract_texts(files, max_workers: int = EXTRACT_WORKERS):
+    """Параллельно извлекает текст из файлов: список (имя, текст, ошибка)"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_extract, files))
+
+
+def encode_in_batches(texts, batch_size: int = BATCH_SIZE) -> dict:
+    """Кодирует уникальные тексты большими батчами, возвращает {текст: эмбеддинг}"""
+    unique = list(dict.fromkeys(texts))
+    embeddings = {}
+    for start in range(0, len(unique), batch_size):
+        batch = unique[start : start + batch_size]
+        embeddings.update(zip(batch, encode_texts(batch)))
+    return embeddings
+
+
+def screen_resumes(job_description, resumes, batch_size: int = BATCH_SIZE) -> list:
+    """Ранжирует резюме по соответствию одной вакансии
+
+    resumes — список пар (имя, текст). Вакансия (текст или VacancyProfile)
+    компилируется один раз, предложения и секции всех резюме кодируются
+    общими батчами.
+    """
+    profile = compile_vacancy(job_description)
+    job_skills = profile.skills
+    job_sentence_vectors = profile.sentence_vectors
+    job_embedding = profile.document_vector
+
+    # Сегментируем все резюме и собираем тексты для общего кодирования
+    parsed = []
+    texts = []
+    for name, text in resumes:
+        sentences = sent_tokenize(text)
+        section_texts, _ = _split_sections(text)
+        section_texts = {k: v for k, v in section_texts.items() if v.strip()}
+        parsed.append((name, text, sentences, section_texts))
+        texts.extend(sentences)
+        texts.extend(section_texts.values())
+    embeddings = encode_in_batches(texts, batch_size)
+
+    rows = []
+    for name, text, sentences, section_texts in parsed:
+        resume_vectors = normalize_rows([embeddings[s] for s in sentences])
+        row = {
+            "file": name,
+            "similarity": 100
+            * mean_max_similarity(
+                job_sentence_vectors, resume_vectors, normalized=True
+            ),
+            "missing_skills": sorted(job_skills - extract_skills(text)),
+        }
+        for section in SECTIONS.keys():
+            if section in section_texts:
+                section_vector = normalize_rows(embeddings[section_texts[section]])[0]
+                row[section] = float(section_vector @ job_embedding * 100)
+            else:
+                row[section] = 0.0
+        row["overall_match"] = float(
+            np.mean([row[section] for section in SECTIONS.keys()])
+        )
+        rows.append(row)
+
+    return sorted(rows, key=lambda row: row["similarity"], reverse=True)
+
+
+def screen_files(job_description, files, batch_size: int = BATCH_SIZE) -> list:
+    """Извлекает текст из файлов (включая zip) и ранжирует резюме"""
+    extracted = extract_texts(expand_uploads(files))
+    rows = screen_resumes(
+        job_description,
+        [(name, text) for name, text, error in extracted if error is None],
+        batch_size,
+    )
+    # Файлы, которые не удалось прочитать, показываем в конце списка
+    for name, _, error in extracted:
+        if error is not None:
+            rows.append({"file": name, "error": error})
+    return rows
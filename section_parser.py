@@ -0,0 +1,115 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+
+class SectionParser:
+    """Делит резюме на секции одним регулярным выражением
+
+    Заголовки всех секций объединяются в одну альтернацию (длинные —
+    первыми, поэтому "work experience" не разбивается на "experience").
+    Заголовок ищется только в начале строки (допускаются отступы, маркеры и
+    нумерация списка) и должен занимать строку целиком — возможно, с
+    уточнением в скобках — или отделяться двоеточием или тире, поэтому слово
+    "опыт" в обычном тексте и "Experience-driven" не открывают новую секцию.
+    Результаты разбора кэшируются по хэшу документа.
+    """
+
+    def __init__(self, sections: dict, cache_size: int = 256):
+        self.sections = {
+            section: list(keywords) for section, keywords in sections.items()
+        }
+        self.keywords = {}
+        for section, keywords in self.sections.items():
+            for keyword in keywords:
+                self.keywords.setdefault(self._normalize(keyword), (section, keyword))
+
+        alternation = "|".join(
+            r"[ \t]+".join(re.escape(word) for word in keyword.split())
+            for keyword in sorted(self.keywords, key=len, reverse=True)
+        )
+        self.pattern = re.compile(
+            # Отступы, маркеры списка и нумерация ("1.", "2)", "1.2.")
+            # (год вроде "2019 Experience" нумерацией не считается)
+            r"^[ \t•·*\-–—]*(?:(?:\d+(?:\.\d+)*[.)]|\d+(?:\.\d+)+)[ \t]+)?"
+            rf"(?P<keyword>{alternation})"
+            # Уточнение в скобках: "Опыт работы (5 лет)"
+            r"[ \t]*(?:\([^()\n]*\))?[ \t\r]*"
+            # Дефис сразу перед словом — часть слова ("Experience-driven")
+            r"(?:[:.]|[\-–—](?![^\W\d_])|$)",
+            re.IGNORECASE | re.MULTILINE,
+        )
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(keyword: str) -> str:
+        return " ".join(keyword.lower().split())
+
+    def find_headers(self, text: str) -> list:
+        """Заголовки секций в порядке появления: секция, ключевое слово и позиции"""
+        if not self.keywords:
+            return []
+        headers = []
+        for match in self.pattern.finditer(text):
+            section, keyword = self.keywords[self._normalize(match.group("keyword"))]
+            headers.append(
+                {
+                    "section": section,
+                    "keyword": keyword,
+                    "start": match.start(),
+                    "end": match.end(),
+                }
+            )
+        return headers
+
+    def _parse(self, text: str):
+        headers = self.find_headers(text)
+        section_texts = {section: "" for section in self.sections}
+        for i, header in enumerate(headers):
+            end = headers[i + 1]["start"] if i + 1 < len(headers) else len(text)
+            body = text[header["end"] : end].strip()
+            if body:
+                section_texts[header["section"]] += body + "\n"
+        return section_texts, headers
+
+    def parse(self, text: str):
+        """Тексты секций и найденные заголовки (результат кэшируется по хэшу текста)"""
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if cached is None:
+            cached = self._parse(text)
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = cached
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        section_texts, headers = cached
+        # Копии, чтобы вызывающий код не испортил кэш
+        return dict(section_texts), [dict(header) for header in headers]
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Счетчики попаданий и промахов кэша разбора"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._cache),
+                "max_entries": self.cache_size,
+            }
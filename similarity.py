@@ -0,0 +1,82 @@
+import numpy as np
+
+# Сколько строк второй матрицы (обычно резюме) обрабатывать за один блок
+BLOCK_SIZE = 1024
+
+
+def normalize_rows(embeddings) -> np.ndarray:
+    """L2-нормализует строки матрицы эмбеддингов (нулевые строки остаются нулевыми)"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if embeddings.ndim == 1:
+        # Одиночный вектор — одна строка, пустой список — пустая матрица
+        embeddings = (
+            embeddings.reshape(1, -1) if embeddings.size else embeddings.reshape(0, 0)
+        )
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+def max_similarity(
+    queries, corpus, block_size: int = BLOCK_SIZE, normalized: bool = False
+) -> np.ndarray:
+    """Для каждой строки queries — максимальная косинусная схожесть со строками corpus
+
+    corpus обрабатывается блоками по block_size строк, поэтому память
+    ограничена len(queries) x block_size, а не полной матрицей схожести.
+    """
+    if not normalized:
+        queries = normalize_rows(queries)
+        corpus = normalize_rows(corpus)
+    result = np.full(len(queries), -np.inf, dtype=np.float32)
+    if len(queries) == 0:
+        return result
+    block_size = block_size or len(corpus) or 1
+    for start in range(0, len(corpus), block_size):
+        block = corpus[start : start + block_size]
+        np.maximum(result, (queries @ block.T).max(axis=1), out=result)
+    return result
+
+
+def mean_max_similarity(
+    queries, corpus, block_size: int = BLOCK_SIZE, normalized: bool = False
+) -> float:
+    """Среднее по строкам queries от максимальной схожести с corpus (0.0 для пустых)"""
+    if len(queries) == 0 or len(corpus) == 0:
+        return 0.0
+    return float(
+        np.mean(max_similarity(queries, corpus, block_size, normalized=normalized))
+    )
+
+
+def threshold_match(
+    queries,
+    corpus,
+    threshold: float,
+    block_size: int = BLOCK_SIZE,
+    normalized: bool = False,
+) -> np.ndarray:
+    """Маска строк queries, для которых в corpus есть строка со схожестью >= threshold"""
+    if len(queries) == 0 or len(corpus) == 0:
+        return np.zeros(len(queries), dtype=bool)
+    return (
+        max_similarity(queries, corpus, block_size, normalized=normalized) >= threshold
+    )
+
+
+def centroid(embeddings) -> np.ndarray:
+    """Нормализованное среднее нормализованных строк — вектор всего документа"""
+    embeddings = normalize_rows(embeddings)
+    if len(embeddings) == 0:
+        return np.zeros(embeddings.shape[1], dtype=np.float32)
+    return normalize_rows(embeddings.mean(axis=0))[0]
+
+
+def top_k(scores, k: int):
+    """Индексы k наибольших значений по убыванию"""
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    indices = np.argpartition(-scores, k - 1)[:k]
+    return indices[np.argsort(-scores[indices], kind="stable")]
@@ -0,0 +1,109 @@
+import re
+from typing import NamedTuple
+
+# Навыки не длиннее этого (r, go) легко совпадают с частями слов вроде "R&D",
+# "go-to": для них "&", апостроф и дефис со строчным латинским словом по
+# соседству тоже считаются частью слова. Дефис перед кириллицей ("Go-разработчик")
+# или словами из SHORT_SKILL_SUFFIXES ("C#-developer") навык не скрывает
+SHORT_SKILL_LENGTH = 2
+SHORT_SKILL_SUFFIXES = ("developer", "developers", "engineer", "engineers", "dev")
+
+
+def _trie_pattern(keywords) -> str:
+    """Строит регулярное выражение по префиксному дереву ключевых слов
+
+    Движок re не оптимизирует длинные альтернации, а дерево дает выбор
+    ветки по первому символу. Необязательные окончания жадные, поэтому
+    сначала пробуется самое длинное ключевое слово.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+        if not branches:
+            return ""
+        pattern = "(?:" + "|".join(branches) + ")"
+        return pattern + "?" if "" in node else pattern
+
+    return build(trie)
+
+
+class SkillMatch(NamedTuple):
+    """Найденный в тексте навык с позицией и категориями из словаря"""
+
+    skill: str
+    start: int
+    end: int
+    categories: tuple
+
+
+class SkillMatcher:
+    """Словарь навыков, скомпилированный в одно регулярное выражение
+
+    Ключевые слова объединяются в одно выражение (длинные — первыми),
+    поэтому документ просматривается за один линейный проход. Границы
+    токенов учитывают "+", "#", "." и "-" внутри навыков (c++, c#, node.js,
+    scikit-learn) и не дают "go" совпасть с "google", а "r" — с любым словом.
+    Короткие навыки дополнительно не совпадают рядом с "&", апострофом и
+    дефисом, за которым (или перед которым) идет строчное латинское слово.
+    """
+
+    def __init__(self, skills_by_category: dict, stop_words=()):
+        stop_words = {word.lower() for word in stop_words}
+        self.categories = {}
+        for category, keywords in skills_by_category.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword in stop_words:
+                    continue
+                self.categories.setdefault(keyword, [])
+                if category not in self.categories[keyword]:
+                    self.categories[keyword].append(category)
+        self.categories = {k: tuple(v) for k, v in self.categories.items()}
+
+        short = [k for k in self.categories if len(k) <= SHORT_SKILL_LENGTH]
+        regular = [k for k in self.categories if len(k) > SHORT_SKILL_LENGTH]
+        # Слева — не буква/цифра/"+"/"#", справа — не буква и не "+"/"#"
+        # (цифры справа допустимы: python3, vue3)
+        branches = []
+        if regular:
+            branches.append(rf"(?:{_trie_pattern(regular)})(?![^\W\d]|[+#])")
+        if short:
+            # Длинные ветки идут первыми, поэтому "golang" не станет "go".
+            # (?-i:...) — строчные буквы даже при IGNORECASE: "x-go", но не "X-Go"
+            suffixes = "|".join(SHORT_SKILL_SUFFIXES)
+            branches.append(
+                rf"(?<![&'])(?<!(?-i:[a-z])-)(?:{_trie_pattern(short)})"
+                rf"(?![^\W\d]|[+#&']|-(?!(?:{suffixes})\b)(?-i:[a-z]))"
+            )
+        self.pattern = re.compile(
+            rf"(?<![\w+#])(?:{'|'.join(branches)})",
+            re.IGNORECASE,
+        )
+
+    def finditer(self, text: str):
+        """Перебирает совпадения навыков в тексте за один проход"""
+        if not self.categories:
+            return
+        for match in self.pattern.finditer(text):
+            skill = match.group(0).lower()
+            categories = self.categories.get(skill)
+            if categories is not None:
+                yield SkillMatch(skill, match.start(), match.end(), categories)
+
+    def find(self, text: str) -> list:
+        """Список всех совпадений навыков с позициями и категориями"""
+        return list(self.finditer(text))
+
+    def skills(self, text: str) -> set:
+        """Множество найденных навыков"""
+        return {match.skill for match in self.finditer(text)}
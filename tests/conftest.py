@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# Тесты не должны писать кэши и результаты на диск
+os.environ["HR_ASSISTANT_EMBEDDING_DB"] = ""
+os.environ["HR_ASSISTANT_RESULT_DB"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def stand_in_model(monkeypatch):
+    """Заглушка энкодера без весов и regex-сегментатор без данных NLTK"""
+    import text_processing
+    import utils
+    from model_server import HashingEncoder
+
+    encoder = HashingEncoder()
+    monkeypatch.setattr(utils, "model", encoder)
+    monkeypatch.setattr(text_processing, "SEGMENTER", "regex")
+    utils.embedding_cache.clear()
+    text_processing.get_document.cache_clear()
+    yield encoder
+    utils.embedding_cache.clear()
+    text_processing.get_document.cache_clear()
@@ -0,0 +1,138 @@
+"""Планировщик батчей: предел размера батча и ошибки фонового потока"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from batcher import EmbeddingBatcher
+
+
+def encode(texts):
+    return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+def test_large_request_is_split_into_capped_batches():
+    sizes = []
+
+    def recording_encode(texts):
+        sizes.append(len(texts))
+        return encode(texts)
+
+    batcher = EmbeddingBatcher(recording_encode, max_batch=4, max_wait=0.01)
+    texts = ["x" * i for i in range(1, 11)]
+    vectors = batcher.encode_batch(texts)
+    batcher.close()
+    assert vectors[:, 0].tolist() == list(range(1, 11))
+    assert max(sizes) <= 4
+
+
+def test_concurrent_requests_do_not_overflow_batch():
+    sizes = []
+    release = threading.Event()
+
+    def slow_encode(texts):
+        sizes.append(len(texts))
+        release.wait(1)
+        return encode(texts)
+
+    batcher = EmbeddingBatcher(slow_encode, max_batch=4, max_wait=0.05)
+    futures = [batcher.submit([f"text {i}", f"text {i}!", f"{i}"]) for i in range(5)]
+    release.set()
+    for future in futures:
+        assert future.result(timeout=5).shape == (3, 2)
+    batcher.close()
+    assert max(sizes) <= 4
+
+
+def test_error_outside_encode_fails_request_and_keeps_worker():
+    calls = []
+
+    def broken_once(texts):
+        calls.append(texts)
+        if len(calls) == 1:
+            return encode(texts)[:1]
+        return encode(texts)
+
+    batcher = EmbeddingBatcher(broken_once, max_wait=0)
+    with pytest.raises(IndexError):
+        batcher.encode_batch(["a", "bb"])
+    assert batcher.encode_batch(["ccc"])[0, 0] == 3.0
+    batcher.close()
+
+
+def test_dead_worker_fails_pending_and_new_requests():
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_encode(texts):
+        started.set()
+        release.wait(5)
+        raise SystemExit
+
+    batcher = EmbeddingBatcher(blocking_encode, max_wait=0)
+    running = batcher.submit(["a"])
+    started.wait(5)
+    pending = batcher.submit(["b"])
+    release.set()
+    for future in (running, pending):
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    with pytest.raises(RuntimeError):
+        batcher.submit(["c"])
+    batcher.close()
+    assert not batcher._thread.is_alive()
+
+
+def test_close_encodes_carried_request():
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_encode(texts):
+        started.set()
+        release.wait(5)
+        return encode(texts)
+
+    batcher = EmbeddingBatcher(slow_encode, max_batch=4, max_wait=0.05)
+    first = batcher.submit(["a"])
+    started.wait(5)
+    # Пока модель занята, в очереди копятся запросы; второй не поместится
+    # в батч к первому и будет перенесен, после него сразу идет остановка
+    queued = [batcher.submit(["bb", "cc", "dd"]), batcher.submit(["eee", "fff"])]
+    closing = threading.Thread(target=batcher.close)
+    closing.start()
+    release.set()
+    closing.join(5)
+    assert first.result(timeout=5).shape == (1, 2)
+    assert [future.result(timeout=5)[:, 0].tolist() for future in queued] == [
+        [2.0, 2.0, 2.0],
+        [3.0, 3.0],
+    ]
+
+
+def test_submit_after_close_is_rejected():
+    batcher = EmbeddingBatcher(encode, max_wait=0)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.encode_batch(["a"])
+
+
+def test_request_enqueued_during_shutdown_does_not_hang(monkeypatch):
+    batcher = EmbeddingBatcher(encode, max_wait=0)
+    batcher.close()
+    # Гонка: проверка в submit прошла, пока поток еще работал, а последний
+    # проход потока по очереди случился до постановки запроса
+    thread, put = batcher._thread, batcher._queue.put
+    monkeypatch.setattr(batcher, "_closed", False)
+    monkeypatch.setattr(batcher, "_thread", threading.Thread(target=lambda: None))
+    monkeypatch.setattr(batcher._thread, "is_alive", lambda: True)
+
+    def put_then_stop(item, **kwargs):
+        put(item, **kwargs)
+        batcher._closed = True
+
+    monkeypatch.setattr(batcher._queue, "put", put_then_stop)
+    future = batcher.submit(["a"])
+    with pytest.raises(RuntimeError):
+        future.result(timeout=1)
+    assert not thread.is_alive()
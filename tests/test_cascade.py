@@ -0,0 +1,29 @@
+"""Отчет о полноте каскада относительно полного скрининга"""
+
+from cascade import recall_report
+
+FULL = [{"file": name, "similarity": 1.0} for name in ("a", "b", "c", "d")]
+
+
+def screened(*names):
+    return [{"file": name, "similarity": 1.0} for name in names]
+
+
+def test_recall_counts_missed_resumes():
+    report = recall_report(screened("a", "c"), FULL)
+    assert report["k"] == 2
+    assert report["recall_at_k"] == 0.5
+    assert report["missed"] == ["b"]
+
+
+def test_empty_selection_has_no_recall():
+    filtered = [{"file": name, "filtered": True} for name in ("a", "b")]
+    report = recall_report(filtered, FULL)
+    assert report["k"] == 0
+    assert report["recall_at_k"] is None
+
+
+def test_empty_selection_with_depth_has_zero_recall():
+    report = recall_report([], FULL, k=3)
+    assert report["recall_at_k"] == 0.0
+    assert report["missed"] == ["a", "b", "c"]
@@ -0,0 +1,21 @@
+"""Кодирование через общий кэш эмбеддингов"""
+
+import numpy as np
+
+import utils
+
+
+def test_model_version_computed_once_per_call(stand_in_model, monkeypatch):
+    calls = []
+    version = utils.get_model_version
+
+    def counting_version():
+        calls.append(1)
+        return version()
+
+    monkeypatch.setattr(utils, "get_model_version", counting_version)
+    texts = ["Python developer", "Docker", "Python developer", "SQL"]
+    vectors = utils.encode_texts(texts)
+    assert len(calls) == 1
+    assert vectors.shape == (4, stand_in_model.dimension)
+    assert np.array_equal(vectors[0], vectors[2])
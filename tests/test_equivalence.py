@@ -0,0 +1,74 @@
+"""Векторизованный отбор обязанностей совпадает с прежней попарной реализацией"""
+
+import numpy as np
+import pytest
+
+import utils
+
+
+def legacy_select(candidates, encode):
+    """Прежний алгоритм: кодирование по одному и попарное сравнение с принятыми"""
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    responsibilities = []
+    for sentence in candidates:
+        sentence_embedding = encode(sentence)
+        is_duplicate = False
+        for existing in responsibilities:
+            existing_embedding = encode(existing)
+            similarity = cosine_similarity(
+                sentence_embedding.reshape(1, -1), existing_embedding.reshape(1, -1)
+            )[0][0]
+            if similarity > 0.8:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            responsibilities.append(sentence)
+    return responsibilities
+
+
+TEXTS = [
+    """Разработка микросервисов на Python. Разработка микросервисов на Python и Go.
+    Создание REST API для мобильного приложения. Поддержка CI/CD.
+    Development of backend services using Django. Development of backend services
+    using Django and Celery. Testing of REST APIs with pytest. Management of a team.""",
+    """Опыт работы в команде. Разработка и поддержка платформы данных.
+    Разработка и поддержка платформы данных компании. Оптимизация SQL-запросов.
+    Design of data pipelines. Design of data pipelines on Airflow.""",
+    "Нет ни одного подходящего предложения. Просто текст.",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_extract_responsibilities_matches_legacy(stand_in_model, text):
+    sentences = utils.get_document(text).lower_sentences
+    candidates = utils._responsibility_candidates(sentences)
+    expected = legacy_select(candidates, stand_in_model.encode)
+    assert utils.extract_responsibilities(text) == expected
+
+
+def test_fixtures_exercise_deduplication(stand_in_model):
+    """Хотя бы в одном тексте отбрасываются дубликаты, иначе сравнение ничего не доказывает"""
+    text = TEXTS[0]
+    candidates = utils._responsibility_candidates(
+        utils.get_document(text).lower_sentences
+    )
+    assert len(utils.extract_responsibilities(text)) < len(candidates)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_select_responsibilities_matches_legacy_on_random_embeddings(seed):
+    rng = np.random.default_rng(seed)
+    count = int(rng.integers(1, 40))
+    # Небольшое число базовых векторов с шумом дает и дубликаты, и уникальные
+    basis = rng.normal(size=(4, 16))
+    embeddings = basis[rng.integers(0, 4, size=count)] + rng.normal(
+        scale=rng.uniform(0.05, 1.0), size=(count, 16)
+    )
+    embeddings[rng.random(count) < 0.1] = 0.0
+    candidates = [f"sentence {i}" for i in range(count)]
+    vectors = dict(zip(candidates, embeddings))
+
+    expected = legacy_select(candidates, vectors.__getitem__)
+    assert utils._select_responsibilities(candidates, embeddings) == expected
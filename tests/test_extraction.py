@@ -0,0 +1,94 @@
+"""Извлечение текста: регистр расширений, форматы и потоковое деление на предложения"""
+
+import io
+import zipfile
+
+import pytest
+
+import extraction
+from benchmarks.synthetic import make_docx, make_pdf
+from extraction import UnsupportedFormatError, iter_pdf_pages, iter_sentences
+from screening import extract_texts, iter_zip_resumes
+from text_processing import regex_sent_tokenize
+from utils import extract_text_from_file
+
+TEXT = "Python developer. Experience with Django and Docker."
+
+
+@pytest.mark.parametrize("name", ["CV.DOCX", "Resume.Docx", "cv.docx"])
+def test_docx_extension_is_case_insensitive(name):
+    assert "Python developer" in extract_text_from_file(make_docx(TEXT, name))
+
+
+def test_pdf_extension_is_case_insensitive():
+    assert "Python developer" in extract_text_from_file(make_pdf(TEXT, name="CV.PDF"))
+
+
+def test_unsupported_format():
+    file = io.BytesIO(b"plain text")
+    file.name = "resume.txt"
+    with pytest.raises(UnsupportedFormatError):
+        extract_text_from_file(file)
+
+
+def test_zip_members_with_upper_case_extensions():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("A.DOCX", make_docx(TEXT).getvalue())
+        zip_file.writestr("B.PDF", make_pdf(TEXT).getvalue())
+        zip_file.writestr("notes.TXT", "skip me")
+    archive.seek(0)
+
+    files = list(iter_zip_resumes(archive))
+    assert [file.name for file in files] == ["A.DOCX", "B.PDF"]
+    for name, text, error in extract_texts(files):
+        assert error is None, name
+        assert "Python developer" in text
+
+
+def test_iter_sentences_caps_carried_tail():
+    chunks = [f"строка {i} без знаков препинания\n" for i in range(500)]
+    chunks += ["Конец длинного текста. Потом обычное предложение. ", "И еще одно."]
+    tokenized = []
+
+    def tokenize(text):
+        tokenized.append(len(text))
+        return regex_sent_tokenize(text)
+
+    sentences = list(iter_sentences(chunks, tokenize, max_tail=100))
+    assert sentences == ["Потом обычное предложение.", "И еще одно."]
+    assert max(tokenized) < 200
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        ["First sentence. Second one is split", " across chunks. Third."],
+        ["Page one ends mid", "word. Page two. ", "Last page"],
+        ["Строка таблицы | ячейка\n", "Опыт работы. ", "Python! Docker?"],
+    ],
+)
+def test_iter_sentences_match_joined_text(chunks):
+    expected = regex_sent_tokenize("".join(chunks))
+    assert list(iter_sentences(chunks, regex_sent_tokenize)) == expected
+
+
+def test_parallel_pdf_reuses_pool_and_skips_short_files(monkeypatch):
+    monkeypatch.setattr(extraction, "_pool", None)
+    lines = "\n".join(f"Line {i} of the resume." for i in range(200))
+    sequential = "".join(iter_pdf_pages(make_pdf(lines, pages=20), workers=0))
+
+    assert "".join(iter_pdf_pages(make_pdf(TEXT), workers=2)).strip() == TEXT
+    assert extraction._pool is None
+
+    try:
+        assert "".join(iter_pdf_pages(make_pdf(lines, pages=20), workers=2)) == (
+            sequential
+        )
+        pool = extraction._pool
+        assert pool is not None
+        "".join(iter_pdf_pages(make_pdf(lines, pages=20), workers=2))
+        assert extraction._pool is pool
+    finally:
+        if extraction._pool is not None:
+            extraction._terminate_pool(extraction._pool)
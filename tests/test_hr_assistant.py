@@ -0,0 +1,61 @@
+"""Консольный режим: каскадный запуск перезаписывает результаты"""
+
+import json
+
+import cascade
+import hr_assistant
+from benchmarks.synthetic import make_docx
+
+JOB = "Python developer. Experience with Django, Docker and SQL."
+RESUMES = {
+    "a.docx": "Python developer. Built Django services in Docker.",
+    "b.docx": "Go developer. Kubernetes and SQL.",
+    "c.docx": "Accountant. Excel reports.",
+}
+
+
+def rank_by_length(job_description, resumes, top_k=None, **kwargs):
+    """Замена каскада без лексического отбора (ему нужны данные NLTK)"""
+    ranked = sorted(resumes, key=lambda item: -len(item[1]))
+    rows = [{"file": name, "similarity": 1.0} for name, _ in ranked[:top_k]]
+    rows += [{"file": name, "filtered": True} for name, _ in ranked[top_k:]]
+    return rows, None
+
+
+def test_cascade_rerun_rewrites_output(stand_in_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(cascade, "cascade_screen", rank_by_length)
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    for name, text in RESUMES.items():
+        (resumes / name).write_bytes(make_docx(text).getvalue())
+    job = tmp_path / "job.txt"
+    job.write_text(JOB, encoding="utf-8")
+    out = tmp_path / "top.jsonl"
+    argv = [
+        "screen",
+        "--job",
+        str(job),
+        "--resumes",
+        str(resumes),
+        "--out",
+        str(out),
+        "--top-k",
+        "2",
+        "--workers",
+        "1",
+    ]
+
+    expected = set(RESUMES)
+    for added in (None, "d.docx"):
+        if added is not None:
+            # Новое резюме между запусками: рейтинг строится заново по всем
+            (resumes / added).write_bytes(
+                make_docx("Python, Django, Docker").getvalue()
+            )
+            expected.add(added)
+        assert hr_assistant.main(argv) == 0
+        rows = [json.loads(line) for line in out.read_text().splitlines()]
+        assert sorted(row["file"] for row in rows) == sorted(
+            str(resumes / name) for name in expected
+        )
+        assert sum(1 for row in rows if not row.get("filtered")) == 2
@@ -0,0 +1,45 @@
+"""Сервер модели: случайный ключ соединений в файле с правами 0600"""
+
+import os
+import stat
+from multiprocessing import AuthenticationError
+
+import pytest
+
+from model_server import HashingEncoder, ModelClient, ModelServer, key_path
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.delenv("HR_ASSISTANT_MODEL_SERVER_KEY", raising=False)
+    server = ModelServer(str(tmp_path / "model.sock"), HashingEncoder(), "stand-in")
+    server.start()
+    yield server
+    server.close()
+
+
+def test_client_reads_generated_key(server):
+    path = key_path(server.address)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(server.address).st_mode) == 0o600
+    client = ModelClient(server.address)
+    assert client.version == "stand-in"
+    assert client.encode(["Python developer"]).shape == (1, 384)
+    client.close()
+
+
+def test_wrong_key_is_rejected(server):
+    with pytest.raises(AuthenticationError):
+        ModelClient(server.address, authkey=b"hr-assistant")
+
+
+def test_key_file_removed_on_close(tmp_path, monkeypatch):
+    monkeypatch.delenv("HR_ASSISTANT_MODEL_SERVER_KEY", raising=False)
+    address = str(tmp_path / "model.sock")
+    first = ModelServer(address, HashingEncoder(), "stand-in")
+    key = open(key_path(address)).read()
+    first.close()
+    assert not os.path.exists(key_path(address))
+    second = ModelServer(address, HashingEncoder(), "stand-in")
+    assert open(key_path(address)).read() != key
+    second.close()
@@ -0,0 +1,45 @@
+"""Хранилище результатов: выключено по умолчанию и не отдает просроченные записи"""
+
+import importlib
+import time
+
+import result_store
+from result_store import ResultStore
+
+RESULT = {"similarity": 42.0, "missing_skills": {"docker"}}
+
+
+def test_disabled_without_path(monkeypatch):
+    monkeypatch.delenv("HR_ASSISTANT_RESULT_DB", raising=False)
+    try:
+        module = importlib.reload(result_store)
+        assert module.RESULT_STORE_PATH == ""
+        assert module.get_result_store() is None
+    finally:
+        importlib.reload(result_store)
+
+
+def test_round_trip(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    store.put("job", "resume", RESULT)
+    assert store.get("job", "resume") == RESULT
+    assert store.get("job", "other resume") is None
+    store.close()
+
+
+def test_expired_results_are_ignored_and_purged(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"), ttl_days=1)
+    store.put("job", "resume", RESULT)
+    store._db.execute("UPDATE results SET created_at = ?", (time.time() - 2 * 86400,))
+    assert store.get("job", "resume") is None
+    assert store.purge_stale() == 1
+    store.close()
+
+
+def test_fingerprint_depends_on_segmenter(monkeypatch):
+    import text_processing
+
+    monkeypatch.setattr(text_processing, "SEGMENTER", "punkt")
+    punkt = result_store.dictionaries_fingerprint()
+    monkeypatch.setattr(text_processing, "SEGMENTER", "regex")
+    assert result_store.dictionaries_fingerprint() != punkt
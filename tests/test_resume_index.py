@@ -0,0 +1,18 @@
+"""Индекс резюме привязан к версии модели с учетом бэкенда"""
+
+import pytest
+
+import utils
+from resume_index import ResumeIndex
+
+RESUME = "Python developer. Built services with Django and Docker."
+
+
+def test_index_rejects_other_backend(stand_in_model, tmp_path, monkeypatch):
+    index = ResumeIndex(str(tmp_path / "index"))
+    index.add("cv", RESUME)
+    index.close()
+
+    monkeypatch.setattr(utils, "BACKEND", "onnx-int8")
+    with pytest.raises(ValueError, match="onnx-int8"):
+        ResumeIndex(str(tmp_path / "index"))
@@ -0,0 +1,53 @@
+"""Заголовки секций резюме: начало строки, нумерация, уточнения и составные слова"""
+
+import pytest
+
+from section_parser import SectionParser
+from utils import SECTIONS
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return SectionParser(SECTIONS)
+
+
+def headers(parser, text):
+    return [(h["section"], h["keyword"]) for h in parser.find_headers(text)]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Опыт работы\nPython", [("experience", "опыт работы")]),
+        ("  • Skills: Python, Go", [("skills", "skills")]),
+        ("Навыки — Python", [("skills", "навыки")]),
+        ("1. Опыт работы\nPython", [("experience", "опыт работы")]),
+        ("2) Education:\nMIT", [("education", "education")]),
+        ("1.2 Skills\nGo", [("skills", "skills")]),
+        ("Опыт работы (5 лет)\nPython", [("experience", "опыт работы")]),
+        # "experience" внутри "work experience" не открывает отдельный заголовок
+        ("Work experience\nAcme", [("experience", "work experience")]),
+    ],
+)
+def test_headers_found(parser, text, expected):
+    assert headers(parser, text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I have experience with Python and Go",
+        "Большой опыт работы с Python",
+        "Experience-driven engineer",
+        "Навыки-то есть, а опыта нет",
+        "2019 Experience at Acme",
+    ],
+)
+def test_headers_not_found(parser, text):
+    assert headers(parser, text) == []
+
+
+def test_parenthetical_is_not_section_text(parser):
+    sections, _ = parser.parse("Опыт работы (5 лет)\nPython, Django\nОбразование\nМГУ")
+    assert sections["experience"] == "Python, Django\n"
+    assert sections["education"] == "МГУ\n"
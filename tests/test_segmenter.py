@@ -0,0 +1,63 @@
+"""Regex-сегментатор: эталонные границы предложений и согласие с Punkt"""
+
+import pytest
+
+from benchmarks.bench_segmenter import agreement
+from benchmarks.synthetic import make_resume, make_vacancy
+from text_processing import punkt_sent_tokenize, regex_sent_tokenize
+
+# Не ниже этого F1 границ относительно Punkt regex-сегментатор годится для оценки
+MIN_PUNKT_F1 = 0.9
+
+EXPECTED = {
+    "ru": (
+        "Опыт работы 5 лет, т.е. с 2019 г. в компании ООО «Ромашка». "
+        "Отвечал за найм, ревью и т.п. задачи. "
+        "Разработал сервис на Python! Внедрил CI/CD? Да… "
+        "Руководитель — А. С. Пушкин.",
+        [
+            "Опыт работы 5 лет, т.е. с 2019 г. в компании ООО «Ромашка».",
+            "Отвечал за найм, ревью и т.п. задачи.",
+            "Разработал сервис на Python!",
+            "Внедрил CI/CD?",
+            "Да…",
+            "Руководитель — А. С. Пушкин.",
+        ],
+    ),
+    "en": (
+        "Worked with Dr. Smith at Acme Inc. on ML pipelines, e.g. ranking. "
+        'He said "ship it." Then we did. '
+        "Skills: Python, Go, etc. Available from 2024",
+        [
+            "Worked with Dr. Smith at Acme Inc. on ML pipelines, e.g. ranking.",
+            'He said "ship it."',
+            "Then we did.",
+            "Skills: Python, Go, etc. Available from 2024",
+        ],
+    ),
+}
+
+
+@pytest.mark.parametrize("lang", sorted(EXPECTED))
+def test_regex_expected_splits(lang):
+    text, sentences = EXPECTED[lang]
+    assert regex_sent_tokenize(text) == sentences
+
+
+def _punkt_available():
+    try:
+        punkt_sent_tokenize("Проверка. Check.")
+    except LookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not _punkt_available(), reason="данные Punkt недоступны")
+@pytest.mark.parametrize("lang", ["ru", "en"])
+def test_regex_agrees_with_punkt(lang):
+    for text in (
+        make_resume(60, lang=lang, seed=2),
+        make_vacancy(20, lang=lang, seed=1),
+    ):
+        result = agreement(text, punkt_sent_tokenize(text), regex_sent_tokenize(text))
+        assert result["f1"] >= MIN_PUNKT_F1
@@ -0,0 +1,40 @@
+"""Границы навыков: короткие навыки не совпадают с частями слов"""
+
+import pytest
+
+from utils import extract_skills
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Знание Go, R и C++", {"go", "r", "c++"}),
+        ("Пишу на R.", {"r"}),
+        ("Go/Rust", {"go", "rust"}),
+        ("python3, vue3", {"python", "vue"}),
+        ("scikit-learn и node.js", {"scikit-learn", "node.js"}),
+        ("c++-based service", {"c++"}),
+        ("Ищем Go-разработчика", {"go"}),
+        ("Senior C#-developer", {"c#"}),
+        ("R-скрипты для аналитики", {"r"}),
+        ("Go-developer и Go-Engineer", {"go"}),
+    ],
+)
+def test_skills_found(text, expected):
+    assert extract_skills(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, absent",
+    [
+        ("Отдел R&D", "r"),
+        ("D&R", "r"),
+        ("R's ecosystem", "r"),
+        ("my go-to tool", "go"),
+        ("x-go", "go"),
+        ("google cloud", "go"),
+        ("golang", "go"),
+    ],
+)
+def test_short_skills_not_matched_inside_words(text, absent):
+    assert absent not in extract_skills(text)
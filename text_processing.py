@@ -0,0 +1,211 @@
+"""Общий слой обработки текста: токенизация, стоп-слова и кэш разобранных документов
+
+Document хранит нижний регистр, предложения и токены текста, вычисляя каждое
+представление один раз. get_document кэширует документы по тексту, поэтому
+анализ одной пары вакансия–резюме разбивает каждый текст на предложения
+один раз, а не в каждой функции заново.
+"""
+
+import os
+import re
+import threading
+from functools import cached_property, lru_cache
+
+from backends import OFFLINE
+
+# Локальный каталог данных NLTK (используется, если существует)
+NLTK_DATA_DIR = os.environ.get(
+    "HR_ASSISTANT_NLTK_DATA", os.path.join(os.path.dirname(__file__), "nltk_data")
+)
+
+# Сегментатор предложений: Punkt из NLTK или быстрый на регулярных выражениях
+SEGMENTERS = ("punkt", "regex")
+SEGMENTER = os.environ.get("HR_ASSISTANT_SEGMENTER", "punkt")
+
+# Сколько разобранных документов держать в памяти
+DOCUMENT_CACHE_SIZE = 256
+
+# Ресурсы NLTK, наличие которых уже проверено
+_nltk_ready = set()
+_nltk_lock = threading.Lock()
+
+
+def _ensure_nltk_data(resource: str, package: str):
+    """Проверяет ресурс NLTK при первом использовании, а не при импорте модуля
+
+    В офлайн-режиме (HR_ASSISTANT_OFFLINE=1) данные не скачиваются:
+    отсутствующий ресурс — ошибка с подсказкой, куда его положить.
+    """
+    if resource in _nltk_ready:
+        return
+    import nltk
+
+    with _nltk_lock:
+        if os.path.isdir(NLTK_DATA_DIR) and NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            if OFFLINE:
+                raise LookupError(
+                    f"Ресурс NLTK {package} не найден, а загрузка запрещена "
+                    f"офлайн-режимом; поместите его в {NLTK_DATA_DIR}"
+                ) from None
+            nltk.download(package, quiet=True)
+        _nltk_ready.add(resource)
+
+
+def punkt_sent_tokenize(text, language="english"):
+    """Разбиение на предложения моделью Punkt (NLTK загружается при первом вызове)"""
+    _ensure_nltk_data("tokenizers/punkt", "punkt")
+    from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+
+    return nltk_sent_tokenize(text, language)
+
+
+# Сокращения, после точки в которых предложение не заканчивается
+ABBREVIATIONS = {
+    "т.е",
+    "т.д",
+    "т.п",
+    "т.к",
+    "т.н",
+    "и.о",
+    "др",
+    "пр",
+    "г",
+    "гг",
+    "им",
+    "ул",
+    "д",
+    "тыс",
+    "млн",
+    "млрд",
+    "руб",
+    "стр",
+    "см",
+    "напр",
+    "англ",
+    "e.g",
+    "i.e",
+    "etc",
+    "vs",
+    "mr",
+    "mrs",
+    "ms",
+    "dr",
+    "prof",
+    "inc",
+    "ltd",
+    "jr",
+    "sr",
+    "st",
+    "no",
+    "approx",
+    "dept",
+}
+
+# Кандидат в границу: знак конца предложения, закрывающие кавычки и пробел
+_BOUNDARY = re.compile(r"[.!?…]+[\"'»”)\]]*\s+")
+
+
+def regex_sent_tokenize(text, language="english"):
+    """Быстрое разбиение на предложения по знакам препинания (русский и английский)
+
+    Граница — ".", "!", "?" или "…" и пробел после них. Одиночная точка не
+    завершает предложение после сокращения из ABBREVIATIONS и после одиночной
+    буквы (инициалы). Язык не учитывается, параметр оставлен для совместимости.
+    """
+    sentences = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        end = match.start()
+        # После закрывающей кавычки или скобки предложение заканчивается всегда
+        if match.group(0).rstrip() == ".":
+            words = text[max(start, end - 32) : end].rsplit(None, 1)
+            word = words[-1].lower().lstrip("\"'«“([") if words else ""
+            if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+                continue
+        sentence = text[start : match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def sent_tokenize(text, language="english"):
+    """Разбиение текста на предложения сегментатором из HR_ASSISTANT_SEGMENTER"""
+    if SEGMENTER not in SEGMENTERS:
+        raise ValueError(
+            f"Неизвестный сегментатор {SEGMENTER!r}, доступны: {', '.join(SEGMENTERS)}"
+        )
+    if SEGMENTER == "regex":
+        return regex_sent_tokenize(text, language)
+    return punkt_sent_tokenize(text, language)
+
+
+def word_tokenize(text, language="english"):
+    """Разбиение текста на слова (NLTK загружается при первом вызове)"""
+    _ensure_nltk_data("tokenizers/punkt", "punkt")
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+
+    return nltk_word_tokenize(text, language)
+
+
+@lru_cache(maxsize=None)
+def get_stop_words() -> frozenset:
+    """Русские и английские стоп-слова NLTK (множество строится один раз)"""
+    _ensure_nltk_data("corpora/stopwords", "stopwords")
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words("russian") + stopwords.words("english"))
+
+
+class Document:
+    """Текст с лениво вычисляемыми и закэшированными представлениями
+
+    Списки предложений и токенов общие для всех пользователей документа —
+    их нельзя изменять на месте.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def sentences(self) -> list:
+        """Предложения исходного текста"""
+        return sent_tokenize(self.text)
+
+    @cached_property
+    def lower_sentences(self) -> list:
+        """Предложения текста в нижнем регистре (для поиска обязанностей)"""
+        return sent_tokenize(self.lower)
+
+    @cached_property
+    def tokens(self) -> list:
+        """Слова текста в нижнем регистре без знаков препинания"""
+        return word_tokenize(re.sub(r"[^\w\s]", " ", self.lower))
+
+    @cached_property
+    def content_tokens(self) -> list:
+        """Слова без стоп-слов"""
+        stop_words = get_stop_words()
+        return [token for token in self.tokens if token not in stop_words]
+
+    @cached_property
+    def preprocessed(self) -> str:
+        """Текст для лексических методов: слова без стоп-слов через пробел"""
+        return " ".join(self.content_tokens)
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def get_document(text: str) -> Document:
+    """Документ для текста; повторные вызовы с тем же текстом возвращают тот же объект"""
+    return Document(text)
@@ -1,56 +1,203 @@
+import hashlib
+import json
 import os
-import re
+import threading
+from typing import TYPE_CHECKING
 
-import nltk
 import numpy as np
-import PyPDF2
-from docx import Document
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from transformers import logging
-
-# Отключаем предупреждения transformers
-logging.set_verbosity_error()
-
-# Загружаем необходимые ресурсы NLTK
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt", quiet=True)
+
+from backends import BACKEND, load_encoder
+from batcher import EmbeddingBatcher
+from embedding_cache import EmbeddingCache, make_key, normalize_text
+from extraction import iter_docx_blocks, iter_pdf_pages, iter_text_chunks
+from metrics import increment, record_size, register_stats_source, timed
+from model_server import ModelClient
+from section_parser import SectionParser
+from similarity import mean_max_similarity, normalize_rows, threshold_match
+from skill_matcher import SkillMatcher
+from text_processing import get_document, sent_tokenize
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 # Путь для кэширования модели
 CACHE_DIR = os.path.join(os.path.dirname(__file__), "model_cache")
 
-# Инициализация модели для многоязычного анализа
+# Название модели для многоязычного анализа
+MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# Сокет сервера модели: если задан, модель не загружается в этот процесс
+MODEL_SERVER = os.environ.get("HR_ASSISTANT_MODEL_SERVER")
+
+# Прогревать ли модель при старте приложения
+WARMUP_ENABLED = os.environ.get("HR_ASSISTANT_WARMUP", "1") != "0"
+
+# Размер кэша эмбеддингов в памяти и путь к необязательному кэшу на диске
+EMBEDDING_CACHE_SIZE = int(os.environ.get("HR_ASSISTANT_EMBEDDING_CACHE_SIZE", "20000"))
+EMBEDDING_CACHE_DB = os.environ.get("HR_ASSISTANT_EMBEDDING_DB")
+
+# Сколько текстов отправлять в модель за один вызов encode
+ENCODE_BATCH_SIZE = 256
+
+# Планировщик общих батчей для конкурентных сессий: размер батча, ожидание и очередь
+BATCHER_MAX_BATCH = int(os.environ.get("HR_ASSISTANT_BATCH_SIZE", "64"))
+BATCHER_MAX_WAIT_MS = float(os.environ.get("HR_ASSISTANT_BATCH_WAIT_MS", "5"))
+BATCHER_MAX_QUEUE = int(os.environ.get("HR_ASSISTANT_BATCH_QUEUE", "1024"))
+
+# Инициализация модели для многоязычного анализа (один экземпляр на процесс)
 model = None
+_model_lock = threading.Lock()
 
 
-def get_model() -> SentenceTransformer:
-    """Получает модель с кэшированием"""
-    try:
-        # Проверяем наличие кэшированной модели
-        if os.path.exists(CACHE_DIR):
-            return SentenceTransformer(
-                "paraphrase-multilingual-MiniLM-L12-v2",
-                cache_folder=CACHE_DIR,
-                use_auth_token=True,
-            )
+def _load_model() -> "SentenceTransformer":
+    """Загружает модель из кэша или скачивает ее (бэкенд задает HR_ASSISTANT_BACKEND)
 
-        # Если кэша нет, создаем директорию и загружаем модель
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        return SentenceTransformer(
-            "paraphrase-multilingual-MiniLM-L12-v2",
-            cache_folder=CACHE_DIR,
-            use_auth_token=True,
-        )
+    Если задан HR_ASSISTANT_MODEL_SERVER, возвращается клиент сервера модели
+    с тем же интерфейсом encode.
+    """
+    try:
+        if MODEL_SERVER:
+            return ModelClient(MODEL_SERVER)
+        return load_encoder(MODEL_NAME, CACHE_DIR, BACKEND)
     except Exception as e:
         print(f"Ошибка при загрузке модели: {str(e)}")
         # Возвращаем None в случае ошибки
         return None
 
 
+def get_model() -> "SentenceTransformer":
+    """Получает модель с кэшированием (загружается один раз на процесс)"""
+    global model
+    if model is not None:
+        return model
+
+    # Двойная проверка: модель загружает только первый поток
+    with _model_lock:
+        if model is None:
+            model = _load_model()
+    return model
+
+
+def get_model_version() -> str:
+    """Версия модели для ключей кэшей: эмбеддинги разных бэкендов немного различаются"""
+    if MODEL_SERVER:
+        client = get_model()
+        if client is not None:
+            return client.version
+    if BACKEND == "torch":
+        return MODEL_NAME
+    return f"{MODEL_NAME}@{BACKEND}"
+
+
+def content_hash(data) -> str:
+    """SHA-256 содержимого (байты или текст) для ключей кэшей"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def warm_up_model() -> "SentenceTransformer":
+    """Загружает модель и выполняет пробное кодирование, чтобы первый запрос не ждал"""
+    model = get_model()
+    if model is not None and WARMUP_ENABLED:
+        try:
+            model.encode(["Прогрев модели", "Model warm-up"])
+        except Exception as e:
+            print(f"Ошибка при прогреве модели: {str(e)}")
+    return model
+
+
+# Общий кэш эмбеддингов предложений для всех функций анализа
+embedding_cache = EmbeddingCache(
+    max_entries=EMBEDDING_CACHE_SIZE, db_path=EMBEDDING_CACHE_DB
+)
+
+
+@timed
+def encode_texts(texts, on_batch=None) -> np.ndarray:
+    """Кодирует список текстов через общий кэш эмбеддингов
+
+    on_batch(done, total) вызывается после каждого батча модели.
+    """
+    model = get_model()
+    if model is None:
+        raise RuntimeError("модель не была загружена")
+
+    # Версия вычисляется один раз: с сервером модели она требует обращения к клиенту
+    model_version = get_model_version()
+    keys = [make_key(model_version, text) for text in texts]
+    cached = embedding_cache.get_many(keys)
+
+    # Кодируем только уникальные тексты, которых нет в кэше
+    to_encode = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in to_encode:
+            to_encode[key] = normalize_text(text)
+    missing_keys = list(to_encode.keys())
+    total_batches = -(-len(missing_keys) // ENCODE_BATCH_SIZE)
+    for batch_number, start in enumerate(
+        range(0, len(missing_keys), ENCODE_BATCH_SIZE), 1
+    ):
+        batch_keys = missing_keys[start : start + ENCODE_BATCH_SIZE]
+        batch_texts = [to_encode[key] for key in batch_keys]
+        if embedding_batcher is not None:
+            # Батч модели общий с другими сессиями
+            vectors = embedding_batcher.encode_batch(batch_texts)
+            increment("batched_requests")
+        else:
+            vectors = model.encode(batch_texts)
+        increment("encode_calls")
+        increment("sentences_encoded", len(batch_keys))
+        new_items = dict(zip(batch_keys, np.asarray(vectors, dtype=np.float32)))
+        embedding_cache.put_many(new_items)
+        cached.update(new_items)
+        if on_batch is not None:
+            on_batch(batch_number, total_batches)
+
+    if not keys:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    return np.stack([cached[key] for key in keys])
+
+
+def encode_text(text: str) -> np.ndarray:
+    """Кодирует один текст через общий кэш эмбеддингов"""
+    return encode_texts([text])[0]
+
+
+def get_embedding_cache_stats() -> dict:
+    """Статистика кэша эмбеддингов (попадания, промахи, размер)"""
+    return embedding_cache.stats()
+
+
+register_stats_source("embedding_cache", embedding_cache.stats)
+
+# Планировщик батчей (запускается приложением, обслуживающим несколько сессий)
+embedding_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def start_embedding_batcher() -> EmbeddingBatcher:
+    """Запускает общий планировщик кодирования (один на процесс)"""
+    global embedding_batcher
+    with _batcher_lock:
+        if embedding_batcher is None:
+            model = get_model()
+            if model is None:
+                return None
+            embedding_batcher = EmbeddingBatcher(
+                model.encode,
+                max_batch=BATCHER_MAX_BATCH,
+                max_wait=BATCHER_MAX_WAIT_MS / 1000,
+                max_queue=BATCHER_MAX_QUEUE,
+            )
+    return embedding_batcher
+
+
+def get_batcher_stats() -> dict:
+    """Статистика планировщика батчей (пустая, если он не запущен)"""
+    return embedding_batcher.stats() if embedding_batcher is not None else {}
+
+
 # Словари технических навыков
 TECH_SKILLS = {
     # Языки программирования
@@ -202,80 +349,50 @@ RESPONSIBILITY_KEYWORDS = {
 }
 
 
+@timed
 def extract_text_from_file(file):
     """Извлекает текст из PDF или DOCX файла"""
-    if file.name.endswith(".pdf"):
-        return extract_text_from_pdf(file)
-    elif file.name.endswith(".docx"):
-        return extract_text_from_docx(file)
-    else:
-        raise ValueError("Неподдерживаемый формат файла")
+    text = "".join(iter_text_chunks(file))
+    record_size("extracted_chars", len(text))
+    return text
 
 
 def extract_text_from_pdf(file):
     """Извлекает текст из PDF файла"""
-    pdf_reader = PyPDF2.PdfReader(file)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
+    return "".join(iter_pdf_pages(file))
 
 
 def extract_text_from_docx(file):
-    """Извлекает текст из DOCX файла"""
-    doc = Document(file)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
+    """Извлекает текст из DOCX файла (абзацы и таблицы)"""
+    return "".join(iter_docx_blocks(file))
 
 
 def preprocess_text(text):
-    """Предобработка текста"""
-    # Приведение к нижнему регистру
-    text = text.lower()
-
-    # Удаление специальных символов
-    text = re.sub(r"[^\w\s]", " ", text)
+    """Предобработка текста: нижний регистр, без спецсимволов и стоп-слов"""
+    return get_document(text).preprocessed
 
-    # Токенизация
-    tokens = word_tokenize(text)
 
-    # Удаление стоп-слов
-    stop_words = set(stopwords.words("russian") + stopwords.words("english"))
-    tokens = [token for token in tokens if token not in stop_words]
+@timed
+def calculate_similarity(text1, text2: str) -> float:
+    """Вычисляет семантическую схожесть между двумя текстами
 
-    return " ".join(tokens)
-
-
-def calculate_similarity(text1: str, text2: str) -> float:
-    """Вычисляет семантическую схожесть между двумя текстами"""
+    text1 может быть VacancyProfile: тогда используются готовые эмбеддинги
+    предложений вакансии.
+    """
     try:
         model = get_model()
         if model is None:
             return 0.0
 
-        # Разбиваем тексты на предложения
-        sentences1 = sent_tokenize(text1)
-        sentences2 = sent_tokenize(text2)
-
-        # Получаем эмбеддинги
-        embeddings1 = model.encode(sentences1)
-        embeddings2 = model.encode(sentences2)
+        # Разбиваем тексты на предложения и получаем эмбеддинги
+        if isinstance(text1, VacancyProfile):
+            embeddings1 = text1.sentence_vectors
+        else:
+            embeddings1 = encode_texts(get_document(text1).sentences)
+        embeddings2 = encode_texts(get_document(text2).sentences)
 
         # Вычисляем косинусное сходство
-        similarity = np.mean(
-            [
-                np.max(
-                    [
-                        np.dot(emb1, emb2)
-                        / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
-                        for emb2 in embeddings2
-                    ]
-                )
-                for emb1 in embeddings1
-            ]
-        )
+        similarity = mean_max_similarity(embeddings1, embeddings2)
 
         # Преобразуем в проценты
         return float(similarity * 100)
@@ -284,113 +401,142 @@ def calculate_similarity(text1: str, text2: str) -> float:
         return 0.0
 
 
+# Слова, которые не считаются навыками, даже если попадут в словарь
+SKILL_STOP_WORDS = {
+    "опыт",
+    "experience",
+    "работа",
+    "work",
+    "разработка",
+    "development",
+    "создание",
+    "creation",
+    "внедрение",
+    "implementation",
+    "использование",
+    "using",
+    "знание",
+    "knowledge",
+    "умение",
+    "ability",
+    "навык",
+    "skill",
+    "требование",
+    "requirement",
+    "обязанность",
+    "responsibility",
+    "задача",
+    "task",
+    "проект",
+    "project",
+    "верим",
+    "делать",
+    "жизнь",
+    "инструмент",
+    "интеллект",
+    "который",
+    "легче",
+    "лучше",
+    "нам",
+    "наш",
+    "помогает",
+    "усиливает",
+    "что",
+    "это",
+    "агентов",
+    "баз",
+    "будут",
+    "вакансии",
+    "валюта",
+    "векторизованных",
+    "владельцев",
+    "внедрить",
+    "выполнять",
+    "достаточно",
+    "драгоценные",
+    "задач",
+    "задачу",
+    "знаний",
+    "конкретного",
+    "которые",
+    "лет",
+    "металлы",
+    "название",
+    "обязательно",
+    "опыта",
+    "организация",
+    "пайплайна",
+    "перед",
+    "полученного",
+    "продуктов",
+    "промышленное",
+    "процесса",
+    "процессе",
+    "работу",
+    "ранжирование",
+    "реализация",
+    "роли",
+    "сильных",
+    "слабых",
+    "собой",
+    "создания",
+    "создать",
+    "ставим",
+    "сторон",
+    "требования",
+    "уровне",
+    "цепочек",
+    "часть",
+    "эффективные",
+}
+
+# Словарь навыков, скомпилированный один раз при импорте
+SKILL_MATCHER = SkillMatcher(TECH_SKILLS, SKILL_STOP_WORDS)
+
+
+def find_skills(text):
+    """Находит навыки в тексте с позициями и категориями (один проход по тексту)"""
+    return SKILL_MATCHER.find(text)
+
+
+@timed
 def extract_skills(text):
-    """Извлекает навыки из текста (поиск по подстроке, регистронезависимо)"""
-    # Разбиваем текст на предложения
-    sentences = sent_tokenize(text.lower())
-    skills = set()
-    stop_words = {
-        "опыт",
-        "experience",
-        "работа",
-        "work",
-        "разработка",
-        "development",
-        "создание",
-        "creation",
-        "внедрение",
-        "implementation",
-        "использование",
-        "using",
-        "знание",
-        "knowledge",
-        "умение",
-        "ability",
-        "навык",
-        "skill",
-        "требование",
-        "requirement",
-        "обязанность",
-        "responsibility",
-        "задача",
-        "task",
-        "проект",
-        "project",
-        "верим",
-        "делать",
-        "жизнь",
-        "инструмент",
-        "интеллект",
-        "который",
-        "легче",
-        "лучше",
-        "нам",
-        "наш",
-        "помогает",
-        "усиливает",
-        "что",
-        "это",
-        "агентов",
-        "баз",
-        "будут",
-        "вакансии",
-        "валюта",
-        "векторизованных",
-        "владельцев",
-        "внедрить",
-        "выполнять",
-        "достаточно",
-        "драгоценные",
-        "задач",
-        "задачу",
-        "знаний",
-        "конкретного",
-        "которые",
-        "лет",
-        "металлы",
-        "название",
-        "обязательно",
-        "опыта",
-        "организация",
-        "пайплайна",
-        "перед",
-        "полученного",
-        "продуктов",
-        "промышленное",
-        "процесса",
-        "процессе",
-        "работу",
-        "ранжирование",
-        "реализация",
-        "роли",
-        "сильных",
-        "слабых",
-        "собой",
-        "создания",
-        "создать",
-        "ставим",
-        "сторон",
-        "требования",
-        "уровне",
-        "цепочек",
-        "часть",
-        "эффективные",
-    }
-    # Собираем все ключевые слова из TECH_SKILLS в один плоский список
-    all_tech_keywords = set()
-    for group in TECH_SKILLS.values():
-        all_tech_keywords.update([kw.lower() for kw in group])
-    for sentence in sentences:
-        for tech in all_tech_keywords:
-            if tech in sentence and tech not in stop_words:
-                skills.add(tech)
-    return skills
+    """Извлекает навыки из текста (поиск по словарю с учетом границ слов, регистронезависимо)"""
+    return SKILL_MATCHER.skills(text)
+
+
+def _responsibility_candidates(sentences):
+    """Отбирает предложения, содержащие ключевые слова обязанностей"""
+    return [
+        sentence
+        for sentence in sentences
+        if any(keyword in sentence for keyword in RESPONSIBILITY_KEYWORDS)
+    ]
+
+
+def _select_responsibilities(candidates, embeddings):
+    """Отбирает обязанности без дубликатов по готовым эмбеддингам кандидатов"""
+    if not candidates:
+        return []
+
+    # Нормализуем эмбеддинги один раз и считаем все попарные схожести одной операцией
+    normalized = normalize_rows(np.asarray(embeddings).reshape(len(candidates), -1))
+    similarities = normalized @ normalized.T
+
+    # Жадный отбор: предложение — дубликат, если похоже на уже принятое
+    accepted = []
+    for i in range(len(candidates)):
+        if accepted and np.any(similarities[i, accepted] > 0.8):  # Порог схожести
+            continue
+        accepted.append(i)
+    return [candidates[i] for i in accepted]
 
 
+@timed
 def extract_responsibilities(text):
     """Извлекает обязанности из текста"""
     responsibilities = []
-    sentences = sent_tokenize(text.lower())
+    sentences = get_document(text).lower_sentences
     model = get_model()
 
     if model is None:
@@ -398,26 +544,10 @@ def extract_responsibilities(text):
         return responsibilities
 
     try:
-        for sentence in sentences:
-            # Проверяем, содержит ли предложение ключевые слова обязанностей
-            if any(keyword in sentence for keyword in RESPONSIBILITY_KEYWORDS):
-                # Получаем эмбеддинг предложения
-                sentence_embedding = model.encode(sentence)
-
-                # Проверяем, не является ли это дубликатом
-                is_duplicate = False
-                for existing_resp in responsibilities:
-                    existing_embedding = model.encode(existing_resp)
-                    similarity = cosine_similarity(
-                        sentence_embedding.reshape(1, -1),
-                        existing_embedding.reshape(1, -1),
-                    )[0][0]
-                    if similarity > 0.8:  # Порог схожести
-                        is_duplicate = True
-                        break
-
-                if not is_duplicate:
-                    responsibilities.append(sentence)
+        candidates = _responsibility_candidates(sentences)
+        responsibilities = _select_responsibilities(
+            candidates, encode_texts(candidates)
+        )
     except Exception as e:
         print(f"Ошибка при извлечении обязанностей: {str(e)}")
         return responsibilities
@@ -425,14 +555,32 @@ def extract_responsibilities(text):
     return responsibilities
 
 
+def _find_missing_experience(job_responsibilities, job_embeddings, resume_embeddings):
+    """Возвращает обязанности вакансии, не покрытые опытом из резюме"""
+    # Обязанность покрыта, если в резюме есть похожая (порог схожести 0.5)
+    covered = threshold_match(job_embeddings, resume_embeddings, 0.5)
+    return [
+        job_resp
+        for job_resp, is_covered in zip(job_responsibilities, covered)
+        if not is_covered
+    ]
+
+
+@timed
 def analyze_skills(job_description, resume_text):
-    """Анализирует отсутствующие навыки и опыт"""
+    """Анализирует отсутствующие навыки и опыт (вакансия — текст или VacancyProfile)"""
+    profile = job_description if isinstance(job_description, VacancyProfile) else None
+
     # Извлекаем навыки из описания вакансии и резюме
-    job_skills = extract_skills(job_description)
+    if profile is not None:
+        job_skills = profile.skills
+        job_responsibilities = profile.responsibilities
+    else:
+        job_skills = extract_skills(job_description)
+        job_responsibilities = extract_responsibilities(job_description)
     resume_skills = extract_skills(resume_text)
 
     # Извлекаем обязанности
-    job_responsibilities = extract_responsibilities(job_description)
     resume_responsibilities = extract_responsibilities(resume_text)
 
     # Анализируем отсутствующие навыки
@@ -450,19 +598,15 @@ def analyze_skills(job_description, resume_text):
         }
 
     try:
-        for job_resp in job_responsibilities:
-            job_resp_embedding = model.encode(job_resp)
-            max_similarity = 0
-            for resume_resp in resume_responsibilities:
-                resume_resp_embedding = model.encode(resume_resp)
-                similarity = cosine_similarity(
-                    job_resp_embedding.reshape(1, -1),
-                    resume_resp_embedding.reshape(1, -1),
-                )[0][0]
-                max_similarity = max(max_similarity, similarity)
-
-            if max_similarity < 0.5:  # Порог схожести
-                missing_experience.append(job_resp)
+        missing_experience = _find_missing_experience(
+            job_responsibilities,
+            (
+                profile.responsibility_vectors
+                if profile is not None
+                else encode_texts(job_responsibilities)
+            ),
+            encode_texts(resume_responsibilities),
+        )
     except Exception as e:
         print(f"Ошибка при анализе опыта: {str(e)}")
         return {
@@ -473,91 +617,220 @@ def analyze_skills(job_description, resume_text):
     return {"missing_skills": missing_skills, "missing_experience": missing_experience}
 
 
+# Заголовки секций резюме (регистронезависимо, в начале строки)
+SECTIONS = {
+    "experience": ["опыт работы", "experience", "work experience"],
+    "education": ["образование", "education"],
+    "skills": [
+        "навыки",
+        "skills",
+        "технические навыки",
+        "знания и навыки",
+        "ключевые навыки",
+        "основной стек",
+    ],
+}
+
+
+# Дополнительные заголовки секций: JSON {"секция": ["заголовок", ...]}
+SECTIONS_CONFIG = os.environ.get("HR_ASSISTANT_SECTIONS")
+
+
+def load_section_config(path, sections=SECTIONS) -> dict:
+    """Добавляет к секциям заголовки (и новые секции) из JSON-файла"""
+    with open(path, encoding="utf-8") as config_file:
+        extra = json.load(config_file)
+    merged = {section: list(keywords) for section, keywords in sections.items()}
+    for section, keywords in extra.items():
+        merged.setdefault(section, [])
+        merged[section].extend(k for k in keywords if k not in merged[section])
+    return merged
+
+
+if SECTIONS_CONFIG:
+    SECTIONS = load_section_config(SECTIONS_CONFIG)
+
+SECTION_PARSER = SectionParser(SECTIONS)
+register_stats_source("section_parser", SECTION_PARSER.stats)
+
+
+def _split_sections(resume_text):
+    """Делит резюме на секции и возвращает их тексты и найденные заголовки"""
+    return SECTION_PARSER.parse(resume_text)
+
+
+def _build_section_analysis(
+    section_texts, job_embedding, section_embeddings, section_responsibilities
+):
+    """Собирает результат анализа секций по готовым эмбеддингам и обязанностям"""
+    analysis = {}
+    for section in SECTIONS.keys():
+        section_text = section_texts[section]
+        if section_text.strip():
+            similarity = float(
+                normalize_rows(section_embeddings[section])[0]
+                @ normalize_rows(job_embedding)[0]
+            )
+            section_skills = extract_skills(section_text)
+            analysis[section] = {
+                "text": section_text,
+                "relevance": float(similarity * 100),
+                "skills": list(section_skills),
+                "responsibilities": section_responsibilities[section],
+            }
+        else:
+            analysis[section] = {
+                "text": "",
+                "relevance": 0.0,
+                "skills": [],
+                "responsibilities": [],
+            }
+    # Общий процент соответствия
+    if analysis:
+        total_relevance = sum(section["relevance"] for section in analysis.values())
+        average_relevance = total_relevance / len(analysis)
+        analysis["overall_match"] = float(average_relevance)
+    return analysis
+
+
+@timed
 def get_detailed_analysis(job_description, resume_text):
-    """Получает детальный анализ резюме и возвращает найденные заголовки для отладки"""
-    # Ключевые слова для поиска секций (регистронезависимо, с учетом спецсимволов)
-    sections = {
-        "experience": ["опыт работы", "experience", "work experience"],
-        "education": ["образование", "education"],
-        "skills": [
-            "навыки",
-            "skills",
-            "технические навыки",
-            "знания и навыки",
-            "основной стек",
-        ],
-    }
+    """Получает детальный анализ резюме и возвращает найденные заголовки для отладки
 
+    job_description может быть VacancyProfile с готовым эмбеддингом вакансии.
+    """
     analysis = {}
     model = get_model()
     if model is None:
         print("Ошибка: модель не была загружена")
         return analysis
 
-    resume_text_lower = resume_text.lower()
-    # Собираем все заголовки и их позиции с учетом запятых, пробелов и переносов
-    found_headers = []
-    for section, keywords in sections.items():
-        for keyword in keywords:
-            # Регулярка: ищет заголовок как отдельное слово, с возможными пробелами, запятыми, переносами
-            pattern = r"[\s,\n\r]*" + re.escape(keyword.lower()) + r"[\s,\n\r]*"
-            for match in re.finditer(pattern, resume_text_lower):
-                found_headers.append(
-                    {
-                        "section": section,
-                        "keyword": keyword,
-                        "start": match.start(),
-                        "end": match.end(),
-                    }
-                )
-    # Сортируем по позиции
-    found_headers = sorted(found_headers, key=lambda x: x["start"])
-
-    # Извлекаем текст между заголовками
-    section_texts = {k: "" for k in sections.keys()}
-    for i, header in enumerate(found_headers):
-        section = header["section"]
-        start = header["end"]
-        end = (
-            found_headers[i + 1]["start"]
-            if i + 1 < len(found_headers)
-            else len(resume_text)
-        )
-        section_texts[section] += resume_text[start:end].strip() + "\n"
+    section_texts, found_headers = _split_sections(resume_text)
 
     # Анализируем каждую секцию
     try:
-        job_embedding = model.encode(job_description)
-        for section in sections.keys():
-            section_text = section_texts[section]
+        if isinstance(job_description, VacancyProfile):
+            job_embedding = job_description.document_vector
+        else:
+            job_embedding = encode_text(job_description)
+        section_embeddings = {}
+        section_responsibilities = {}
+        for section, section_text in section_texts.items():
             if section_text.strip():
-                section_embedding = model.encode(section_text)
-                similarity = cosine_similarity(
-                    section_embedding.reshape(1, -1), job_embedding.reshape(1, -1)
-                )[0][0]
-                section_skills = extract_skills(section_text)
-                section_responsibilities = extract_responsibilities(section_text)
-                analysis[section] = {
-                    "text": section_text,
-                    "relevance": float(similarity * 100),
-                    "skills": list(section_skills),
-                    "responsibilities": section_responsibilities,
-                }
-            else:
-                analysis[section] = {
-                    "text": "",
-                    "relevance": 0.0,
-                    "skills": [],
-                    "responsibilities": [],
-                }
-        # Общий процент соответствия
-        if analysis:
-            total_relevance = sum(section["relevance"] for section in analysis.values())
-            average_relevance = total_relevance / len(analysis)
-            analysis["overall_match"] = float(average_relevance)
+                section_embeddings[section] = encode_text(section_text)
+                section_responsibilities[section] = extract_responsibilities(
+                    section_text
+                )
+        analysis = _build_section_analysis(
+            section_texts, job_embedding, section_embeddings, section_responsibilities
+        )
         # Для отладки: возвращаем найденные заголовки
         analysis["_debug_headers"] = found_headers
     except Exception as e:
         print(f"Ошибка при детальном анализе: {str(e)}")
         return analysis
     return analysis
+
+
+class VacancyProfile:
+    """Скомпилированная вакансия: все, что не зависит от резюме, считается один раз
+
+    Хранит навыки, обязанности без дубликатов, нормализованные эмбеддинги
+    предложений и обязанностей и эмбеддинг всего текста. Функции анализа
+    принимают профиль вместо текста вакансии, поэтому при проверке многих
+    резюме на одну вакансию кодируется только сторона резюме.
+    """
+
+    def __init__(
+        self,
+        text,
+        sentences,
+        skills,
+        responsibilities,
+        sentence_vectors,
+        responsibility_vectors,
+        document_vector,
+        model_version,
+    ):
+        self.text = text
+        self.sentences = sentences
+        self.skills = skills
+        self.responsibilities = responsibilities
+        self.sentence_vectors = sentence_vectors
+        self.responsibility_vectors = responsibility_vectors
+        self.document_vector = document_vector
+        self.model_version = model_version
+
+    def save(self, path):
+        """Сохраняет профиль в файл .npz"""
+        meta = {
+            "text": self.text,
+            "sentences": self.sentences,
+            "skills": sorted(self.skills),
+            "responsibilities": self.responsibilities,
+            "model_version": self.model_version,
+        }
+        np.savez_compressed(
+            path,
+            sentence_vectors=self.sentence_vectors,
+            responsibility_vectors=self.responsibility_vectors,
+            document_vector=self.document_vector,
+            meta=np.array(json.dumps(meta, ensure_ascii=False)),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Загружает профиль; профиль другой модели использовать нельзя"""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["model_version"] != get_model_version():
+                raise ValueError(
+                    f"Профиль вакансии построен моделью {meta['model_version']}, "
+                    f"а загружена {get_model_version()}"
+                )
+            return cls(
+                text=meta["text"],
+                sentences=meta["sentences"],
+                skills=set(meta["skills"]),
+                responsibilities=meta["responsibilities"],
+                sentence_vectors=data["sentence_vectors"],
+                responsibility_vectors=data["responsibility_vectors"],
+                document_vector=data["document_vector"],
+                model_version=meta["model_version"],
+            )
+
+
+@timed
+def compile_vacancy(job_description) -> VacancyProfile:
+    """Компилирует описание вакансии в VacancyProfile (все тексты кодируются одним вызовом)"""
+    if isinstance(job_description, VacancyProfile):
+        return job_description
+    if get_model() is None:
+        raise RuntimeError("модель не была загружена")
+    document = get_document(job_description)
+    sentences = document.sentences
+    candidates = _responsibility_candidates(document.lower_sentences)
+    vectors = encode_texts([*sentences, *candidates, job_description])
+    candidate_vectors = vectors[len(sentences) : -1]
+    responsibilities = _select_responsibilities(candidates, candidate_vectors)
+    positions = {}
+    for i, candidate in enumerate(candidates):
+        positions.setdefault(candidate, i)
+    dim = vectors.shape[1]
+    return VacancyProfile(
+        text=job_description,
+        sentences=sentences,
+        skills=extract_skills(job_description),
+        responsibilities=responsibilities,
+        sentence_vectors=normalize_rows(vectors[: len(sentences)]).reshape(-1, dim),
+        responsibility_vectors=normalize_rows(
+            candidate_vectors[[positions[r] for r in responsibilities]]
+        ).reshape(-1, dim),
+        document_vector=normalize_rows(vectors[-1])[0],
+        model_version=get_model_version(),
+    )
+
+
+def vacancy_text(job) -> str:
+    """Текст вакансии для текста или VacancyProfile"""
+    return job.text if isinstance(job, VacancyProfile) else job